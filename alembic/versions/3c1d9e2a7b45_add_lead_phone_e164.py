@@ -0,0 +1,73 @@
+"""Add indexed canonical phone column to leads
+
+Revision ID: 3c1d9e2a7b45
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.core.phone import DEFAULT_COUNTRY_CODE, normalize_phone
+
+# revision identifiers, used by Alembic.
+revision: str = "3c1d9e2a7b45"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    # Fresh databases get the column from init_db() (create_all)
+    if not inspector.has_table("leads"):
+        return
+
+    columns = {col["name"] for col in inspector.get_columns("leads")}
+    if "phone_e164" not in columns:
+        with op.batch_alter_table("leads") as batch_op:
+            batch_op.add_column(sa.Column("phone_e164", sa.String(), nullable=True))
+
+    # Backfill existing rows
+    country_code = os.environ.get("DEFAULT_PHONE_COUNTRY_CODE", DEFAULT_COUNTRY_CODE)
+    leads = sa.table(
+        "leads",
+        sa.column("id", sa.Integer),
+        sa.column("phone_number", sa.String),
+        sa.column("phone_e164", sa.String),
+    )
+    rows = bind.execute(
+        sa.select(leads.c.id, leads.c.phone_number).where(leads.c.phone_e164.is_(None))
+    ).all()
+
+    update = (
+        sa.update(leads)
+        .where(leads.c.id == sa.bindparam("lead_id"))
+        .values(phone_e164=sa.bindparam("phone"))
+    )
+    for start in range(0, len(rows), BACKFILL_BATCH_SIZE):
+        batch = rows[start : start + BACKFILL_BATCH_SIZE]
+        bind.execute(
+            update,
+            [
+                {"lead_id": row.id, "phone": normalize_phone(row.phone_number or "", country_code)}
+                for row in batch
+            ],
+        )
+
+    indexes = {index["name"] for index in inspector.get_indexes("leads")}
+    if "ix_leads_phone_e164_is_done" not in indexes:
+        op.create_index("ix_leads_phone_e164_is_done", "leads", ["phone_e164", "is_done"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_leads_phone_e164_is_done", table_name="leads")
+    with op.batch_alter_table("leads") as batch_op:
+        batch_op.drop_column("phone_e164")
@@ -0,0 +1,46 @@
+"""Add claim lease columns to leads
+
+Revision ID: b7e4d2a91c3f
+Revises: 8f2b6c1e4a90
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e4d2a91c3f"
+down_revision: Union[str, None] = "8f2b6c1e4a90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _new_columns() -> list[sa.Column]:
+    """Columns added by this revision (fresh objects per batch operation)."""
+    return [
+        sa.Column("claimed_by", sa.String(), nullable=True),
+        sa.Column("lease_until", sa.DateTime(), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    # Fresh databases get the columns from init_db() (create_all)
+    if not inspector.has_table("leads"):
+        return
+
+    existing = {col["name"] for col in inspector.get_columns("leads")}
+    with op.batch_alter_table("leads") as batch_op:
+        for column in _new_columns():
+            if column.name not in existing:
+                batch_op.add_column(column)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("leads") as batch_op:
+        for column in reversed(_new_columns()):
+            batch_op.drop_column(column.name)
@@ -0,0 +1,46 @@
+"""Add retry backoff and claim time to webhook events
+
+Revision ID: c4e8a1f3d6b2
+Revises: b7e4d2a91c3f
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e8a1f3d6b2"
+down_revision: Union[str, None] = "b7e4d2a91c3f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _new_columns() -> list[sa.Column]:
+    """Columns added by this revision (fresh objects per batch operation)."""
+    return [
+        sa.Column("next_attempt_at", sa.DateTime(), nullable=True),
+        sa.Column("claimed_at", sa.DateTime(), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    # Fresh databases get the columns from init_db() (create_all)
+    if not inspector.has_table("webhook_events"):
+        return
+
+    existing = {col["name"] for col in inspector.get_columns("webhook_events")}
+    with op.batch_alter_table("webhook_events") as batch_op:
+        for column in _new_columns():
+            if column.name not in existing:
+                batch_op.add_column(column)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("webhook_events") as batch_op:
+        for column in reversed(_new_columns()):
+            batch_op.drop_column(column.name)
@@ -0,0 +1,45 @@
+"""Add claim time and item/column index to the Monday status outbox
+
+Revision ID: d9b3e6f2a8c1
+Revises: c4e8a1f3d6b2
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d9b3e6f2a8c1"
+down_revision: Union[str, None] = "c4e8a1f3d6b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ITEM_COLUMN_INDEX = "ix_monday_status_outbox_item_column"
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    # Fresh databases get the column and index from init_db() (create_all)
+    if not inspector.has_table("monday_status_outbox"):
+        return
+
+    existing = {col["name"] for col in inspector.get_columns("monday_status_outbox")}
+    if "claimed_at" not in existing:
+        with op.batch_alter_table("monday_status_outbox") as batch_op:
+            batch_op.add_column(sa.Column("claimed_at", sa.DateTime(), nullable=True))
+
+    indexes = {index["name"] for index in inspector.get_indexes("monday_status_outbox")}
+    if ITEM_COLUMN_INDEX not in indexes:
+        op.create_index(
+            ITEM_COLUMN_INDEX, "monday_status_outbox", ["monday_item_id", "column_id"]
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(ITEM_COLUMN_INDEX, table_name="monday_status_outbox")
+    with op.batch_alter_table("monday_status_outbox") as batch_op:
+        batch_op.drop_column("claimed_at")
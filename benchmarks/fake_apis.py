@@ -0,0 +1,247 @@
+"""
+Local stand-ins for the Monday.com GraphQL API and the WhatsApp Cloud API.
+
+Both fakes answer the requests this service makes, with configurable latency,
+error rate and rate limits (Monday complexity budget, Meta messages/sec), so
+load tests run without network access or real credentials.
+
+Usage (standalone, then point the service at it):
+    python -m benchmarks.fake_apis [--port 9000] [--latency-ms 20] [--error-rate 0.01]
+    MONDAY_API_URL=http://127.0.0.1:9000/monday/v2 \\
+    META_API_BASE_URL=http://127.0.0.1:9000/meta/v18.0 uvicorn src.main:app
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+# Status label of a freshly created Monday item
+NEW_ITEM_STATUS = "לייד חדש"
+
+_MUTATION_ALIAS = re.compile(r"(\w+): change_column_value")
+
+
+def phone_for_item(item_id: str) -> str:
+    """Deterministic Israeli mobile number for a fake Monday item."""
+    digits = int(item_id) if item_id.isdigit() else abs(hash(item_id))
+    return f"+9725{digits % 10**8:08d}"
+
+
+@dataclass
+class FakeAPIConfig:
+    """Behaviour of the stand-in servers."""
+
+    latency_ms: float = 20.0
+    jitter_ms: float = 10.0
+    error_rate: float = 0.0  # Fraction of requests answered with a server error
+    monday_budget_per_minute: int = 1_000_000
+    monday_query_cost: int = 1_000
+    monday_mutation_cost: int = 30_000  # Per change_column_value
+    meta_messages_per_second: float = 80.0
+    seed: int | None = None
+
+
+@dataclass
+class FakeAPIStats:
+    """Request counters, by API and outcome."""
+
+    monday: Counter[str] = field(default_factory=Counter)
+    meta: Counter[str] = field(default_factory=Counter)
+
+    def as_dict(self) -> dict[str, dict[str, int]]:
+        return {"monday": dict(self.monday), "meta": dict(self.meta)}
+
+
+class FakeMonday:
+    """Monday GraphQL stand-in: items/column_values queries and status mutations."""
+
+    def __init__(self, config: FakeAPIConfig, stats: FakeAPIStats, rng: random.Random) -> None:
+        self.config = config
+        self.stats = stats
+        self.rng = rng
+        self.statuses: dict[str, str] = {}
+        self.remaining = config.monday_budget_per_minute
+        self.reset_at = time.monotonic() + 60
+
+    def _cost(self, query: str) -> int:
+        mutations = query.count("change_column_value(")
+        return mutations * self.config.monday_mutation_cost or self.config.monday_query_cost
+
+    def _item(self, item_id: str) -> dict[str, Any]:
+        phone = phone_for_item(item_id)
+        return {
+            "id": item_id,
+            "name": f"Lead {item_id}",
+            "column_values": [
+                {"id": "phone", "text": phone, "value": json.dumps({"phone": phone})},
+                {
+                    "id": "status",
+                    "text": self.statuses.get(item_id, NEW_ITEM_STATUS),
+                    "value": None,
+                },
+            ],
+        }
+
+    def handle(self, body: dict[str, Any]) -> JSONResponse:
+        query = body.get("query", "")
+        variables = body.get("variables") or {}
+
+        if self.rng.random() < self.config.error_rate:
+            self.stats.monday["server_error"] += 1
+            return JSONResponse({"error_message": "Internal server error"}, status_code=500)
+
+        now = time.monotonic()
+        if now >= self.reset_at:
+            self.remaining = self.config.monday_budget_per_minute
+            self.reset_at = now + 60
+
+        cost = self._cost(query)
+        reset_in = max(1, int(self.reset_at - now))
+        if cost > self.remaining:
+            self.stats.monday["rate_limited"] += 1
+            return JSONResponse(
+                {
+                    "errors": [
+                        {
+                            "message": "Complexity budget exhausted",
+                            "extensions": {
+                                "code": "COMPLEXITY_BUDGET_EXHAUSTED",
+                                "retry_in_seconds": reset_in,
+                            },
+                        }
+                    ]
+                }
+            )
+
+        before = self.remaining
+        self.remaining -= cost
+        data: dict[str, Any] = {
+            "complexity": {"before": before, "after": self.remaining, "reset_in_x_seconds": reset_in}
+        }
+
+        # Aliased multi-mutation ("u0: change_column_value(...)") or a single one
+        aliases = _MUTATION_ALIAS.findall(query)
+        if not aliases and "change_column_value(" in query:
+            aliases = ["change_column_value"]
+        if aliases:
+            for alias in aliases:
+                suffix = "" if alias == "change_column_value" else alias[1:]
+                item_id = str(variables.get(f"itemId{suffix}"))
+                label = json.loads(variables.get(f"value{suffix}") or "{}").get("label", "")
+                self.statuses[item_id] = label
+                data[alias] = {"id": item_id}
+            self.stats.monday["mutations"] += len(aliases)
+        elif "items(" in query:
+            ids = variables.get("itemIds") or variables.get("itemId") or []
+            data["items"] = [self._item(str(item_id)) for item_id in ids]
+
+        self.stats.monday["ok"] += 1
+        return JSONResponse({"data": data})
+
+
+class FakeMeta:
+    """WhatsApp Cloud API stand-in for the messages endpoint."""
+
+    def __init__(self, config: FakeAPIConfig, stats: FakeAPIStats, rng: random.Random) -> None:
+        self.config = config
+        self.stats = stats
+        self.rng = rng
+        self.tokens = config.meta_messages_per_second
+        self.refilled_at = time.monotonic()
+
+    def handle(self, body: dict[str, Any]) -> JSONResponse:
+        if self.rng.random() < self.config.error_rate:
+            self.stats.meta["server_error"] += 1
+            return JSONResponse(
+                {"error": {"code": 131000, "message": "Something went wrong"}}, status_code=500
+            )
+
+        now = time.monotonic()
+        rate = self.config.meta_messages_per_second
+        self.tokens = min(rate, self.tokens + (now - self.refilled_at) * rate)
+        self.refilled_at = now
+        if self.tokens < 1:
+            self.stats.meta["rate_limited"] += 1
+            return JSONResponse(
+                {"error": {"code": 130429, "message": "Rate limit hit"}}, status_code=400
+            )
+
+        self.tokens -= 1
+        self.stats.meta["sent"] += 1
+        return JSONResponse(
+            {
+                "messaging_product": "whatsapp",
+                "contacts": [{"input": body.get("to"), "wa_id": body.get("to")}],
+                "messages": [{"id": f"wamid.fake.{self.stats.meta['sent']}"}],
+            }
+        )
+
+
+def create_fake_api_app(config: FakeAPIConfig | None = None) -> FastAPI:
+    """Build the stand-in app (Monday at /monday/v2, Meta at /meta/<version>/...)."""
+    config = config or FakeAPIConfig()
+    rng = random.Random(config.seed)
+    stats = FakeAPIStats()
+    monday = FakeMonday(config, stats, rng)
+    meta = FakeMeta(config, stats, rng)
+
+    app = FastAPI(title="Fake Monday / Meta APIs")
+    app.state.config = config
+    app.state.stats = stats
+    app.state.monday = monday
+
+    async def delay() -> None:
+        jitter = config.jitter_ms * rng.random()
+        await asyncio.sleep(max(0.0, config.latency_ms + jitter) / 1000)
+
+    @app.post("/monday/v2")
+    async def monday_graphql(request: Request) -> JSONResponse:
+        await delay()
+        return monday.handle(await request.json())
+
+    @app.post("/meta/{version}/{phone_id}/messages")
+    async def meta_messages(version: str, phone_id: str, request: Request) -> JSONResponse:
+        await delay()
+        return meta.handle(await request.json())
+
+    @app.get("/stats")
+    async def get_stats() -> dict[str, Any]:
+        return {"config": asdict(config), **stats.as_dict()}
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--monday-budget", type=int, default=1_000_000)
+    parser.add_argument("--meta-rate", type=float, default=80.0)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = FakeAPIConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        monday_budget_per_minute=args.monday_budget,
+        meta_messages_per_second=args.meta_rate,
+    )
+    uvicorn.run(create_fake_api_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
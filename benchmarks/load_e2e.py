@@ -0,0 +1,328 @@
+"""
+End-to-end load benchmark against the local Monday/Meta stand-ins.
+
+Runs the real app in-process (lifespan included) with its HTTP clients routed
+to benchmarks.fake_apis, on a fresh temporary SQLite database:
+
+1. Floods /webhook/monday with new-lead events
+2. Runs the initial-message job and waits for the Monday outbox to drain
+3. Floods /webhook/meta with replies from part of the leads
+4. Runs the follow-up job for the rest, and drains the outbox again
+
+In queued ingestion mode, each flood also waits for the durable webhook
+queue to drain, so every count is read once the work is done.
+
+Reports leads/sec, p50/p99 webhook latency and send throughput. No network
+access is needed, so it can run in CI; --json writes the numbers for
+comparison between runs.
+
+Usage:
+    python -m benchmarks.load_e2e [--leads 500] [--concurrency 20] [--latency-ms 20]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from benchmarks.fake_apis import FakeAPIConfig, create_fake_api_app, phone_for_item
+
+# Hosts are never resolved: clients are routed to the in-process fake app
+FAKE_MONDAY_URL = "http://monday.fake/monday/v2"
+FAKE_META_URL = "http://meta.fake/meta/v18.0"
+
+
+def _configure_env(db_path: Path, args: argparse.Namespace) -> None:
+    """Settings for the benchmark run (must be set before src is imported)."""
+    defaults = {
+        "MONDAY_API_KEY": "bench",
+        "MONDAY_BOARD_ID": "1",
+        "META_API_TOKEN": "bench",
+        "META_PHONE_ID": "1",
+        "MONDAY_API_URL": FAKE_MONDAY_URL,
+        "META_API_BASE_URL": FAKE_META_URL,
+        "META_APP_SECRET": "bench",  # Meta webhooks are signed like in production
+        "DATABASE_URL": f"sqlite+aiosqlite:///{db_path}",
+        "ENVIRONMENT": "production",
+        "LOG_LEVEL": "WARNING",
+        # Leads are due immediately and the send window never closes
+        "INITIAL_MESSAGE_DELAY_MINUTES": "0",
+        "SEND_WINDOW_START_HOUR": "0",
+        "SEND_WINDOW_END_HOUR": "24",
+        # Jobs are run explicitly by the benchmark, not by the interval trigger
+        "SCHEDULER_MODE": "interval",
+        "SCHEDULER_INTERVAL_MINUTES": "1440",
+        "SCHEDULER_MAX_CONCURRENCY": str(args.scheduler_concurrency),
+        "MONDAY_COMPLEXITY_BUDGET_PER_MINUTE": str(args.monday_budget),
+    }
+    for key, value in defaults.items():
+        os.environ.setdefault(key, value)
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    """Percentile of latency samples in ms (0 if empty)."""
+    if not samples:
+        return 0.0
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[int(pct) - 1]
+
+
+async def _flood(
+    client: httpx.AsyncClient,
+    path: str,
+    payloads: list[dict[str, Any]],
+    concurrency: int,
+    app_secret: str = "",
+) -> dict[str, Any]:
+    """
+    POST every payload with bounded concurrency; return latency/throughput stats.
+
+    Bodies are signed (X-Hub-Signature-256) when an app secret is given.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+
+    async def post(payload: dict[str, Any]) -> None:
+        body = json.dumps(payload).encode()
+        headers = {"Content-Type": "application/json"}
+        if app_secret:
+            digest = hmac.new(app_secret.encode(), body, hashlib.sha256).hexdigest()
+            headers["X-Hub-Signature-256"] = f"sha256={digest}"
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post(path, content=body, headers=headers)
+            latencies.append((time.perf_counter() - started) * 1000)
+            status = response.json().get("status", str(response.status_code))
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(post(payload) for payload in payloads))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(payloads),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(payloads) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(_percentile(latencies, 50), 1),
+        "p99_ms": round(_percentile(latencies, 99), 1),
+        "statuses": statuses,
+    }
+
+
+def _monday_event(item_id: int) -> dict[str, Any]:
+    return {
+        "event": {
+            "boardId": 1,
+            "pulseId": item_id,
+            "groupId": "topics",
+            "originalTriggerUuid": str(uuid.uuid4()),
+        }
+    }
+
+
+def _meta_reply(item_id: int) -> dict[str, Any]:
+    return {
+        "object": "whatsapp_business_account",
+        "entry": [
+            {
+                "changes": [
+                    {
+                        "field": "messages",
+                        "value": {
+                            "messages": [
+                                {
+                                    "from": phone_for_item(str(item_id)).lstrip("+"),
+                                    "id": f"wamid.in.{uuid.uuid4().hex}",
+                                    "type": "text",
+                                    "text": {"body": "hi"},
+                                }
+                            ]
+                        },
+                    }
+                ]
+            }
+        ],
+    }
+
+
+async def run(args: argparse.Namespace, db_path: Path) -> dict[str, Any]:
+    """Run all phases and return the report."""
+    _configure_env(db_path, args)
+
+    from sqlalchemy import func, select, update
+
+    from src.core.config import get_settings
+    from src.db.models import Lead, MondayStatusOutbox, WebhookEvent
+    from src.db.session import get_session
+    from src.main import app
+    from src.services.meta import meta_service
+    from src.services.monday import monday_service
+    from src.services.scheduler import scheduler_service
+
+    fake_app = create_fake_api_app(
+        FakeAPIConfig(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            monday_budget_per_minute=args.monday_budget,
+            meta_messages_per_second=args.meta_rate,
+            seed=args.seed,
+        )
+    )
+    stats = fake_app.state.stats
+    fake_transport = httpx.ASGITransport(app=fake_app)
+    monday_service._client = httpx.AsyncClient(
+        transport=fake_transport, headers=monday_service.headers
+    )
+    meta_service._client = httpx.AsyncClient(
+        transport=fake_transport, headers=meta_service.headers
+    )
+
+    async def count(*filters: Any, model: Any = Lead) -> int:
+        async with get_session() as session:
+            result = await session.scalar(select(func.count()).select_from(model).where(*filters))
+            return int(result or 0)
+
+    async def drain(*filters: Any, model: Any) -> int:
+        """Wait (up to --drain-timeout) until no rows match; return how many are left."""
+        deadline = time.monotonic() + args.drain_timeout
+        while await count(*filters, model=model) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        return await count(*filters, model=model)
+
+    async def drain_webhook_queue() -> int:
+        """Wait for queued webhook events to be processed (processed events are deleted)."""
+        return await drain(
+            WebhookEvent.status.in_(("pending", "processing")), model=WebhookEvent
+        )
+
+    async def timed_job(job: Any) -> dict[str, Any]:
+        sends_before = stats.meta["sent"]
+        started = time.perf_counter()
+        await job()
+        elapsed = time.perf_counter() - started
+        sent = stats.meta["sent"] - sends_before
+        return {
+            "seconds": round(elapsed, 3),
+            "messages_sent": sent,
+            "sends_per_second": round(sent / elapsed, 1) if elapsed else 0.0,
+        }
+
+    item_ids = list(range(1, args.leads + 1))
+    report: dict[str, Any] = {"config": vars(args)}
+    pending: dict[str, int] = {}
+    report["pending_after_drain"] = pending
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://service"
+        ) as client:
+            started = time.perf_counter()
+            monday_flood = await _flood(
+                client, "/webhook/monday", [_monday_event(i) for i in item_ids], args.concurrency
+            )
+            pending["webhook_queue_monday"] = await drain_webhook_queue()
+            # Leads/sec covers ingestion until the leads exist (queue drained)
+            ingest_seconds = time.perf_counter() - started
+            created = await count()
+            monday_flood["leads_per_second"] = (
+                round(created / ingest_seconds, 1) if ingest_seconds else 0.0
+            )
+            report["monday_webhooks"] = monday_flood
+
+            report["initial_messages"] = await timed_job(
+                scheduler_service.process_pending_initial_messages
+            )
+            # Let the outbox dispatcher deliver the status writes
+            pending["outbox_initial"] = await drain(model=MondayStatusOutbox)
+
+            repliers = item_ids[: int(len(item_ids) * args.reply_ratio)]
+            report["meta_webhooks"] = await _flood(
+                client,
+                "/webhook/meta",
+                [_meta_reply(i) for i in repliers],
+                args.concurrency,
+                app_secret=get_settings().meta_app_secret,
+            )
+            pending["webhook_queue_meta"] = await drain_webhook_queue()
+
+            async with get_session() as session:
+                await session.execute(
+                    update(Lead)
+                    .where(Lead.is_done == False, Lead.first_message_sent == True)  # noqa: E712
+                    .values(followup_due_at=Lead.created_at)
+                )
+            report["followups"] = await timed_job(scheduler_service.process_pending_followups)
+            pending["outbox_followups"] = await drain(model=MondayStatusOutbox)
+
+    report["leads"] = {
+        "created": created,
+        "initial_sent": await count(Lead.first_message_sent == True),  # noqa: E712
+        "done": await count(Lead.is_done == True),  # noqa: E712
+        "dead_lettered": await count(Lead.dead_lettered_at.isnot(None)),
+    }
+    report["fake_apis"] = stats.as_dict()
+    return report
+
+
+def _print_report(report: dict[str, Any]) -> None:
+    monday = report["monday_webhooks"]
+    meta = report["meta_webhooks"]
+    print(
+        f"/webhook/monday  {monday['requests']:>6} req  {monday['leads_per_second']:>8.1f} leads/s"
+        f"  p50 {monday['p50_ms']:>7.1f} ms  p99 {monday['p99_ms']:>7.1f} ms"
+    )
+    print(
+        f"/webhook/meta    {meta['requests']:>6} req  {meta['requests_per_second']:>8.1f} req/s  "
+        f"  p50 {meta['p50_ms']:>7.1f} ms  p99 {meta['p99_ms']:>7.1f} ms"
+    )
+    for job in ("initial_messages", "followups"):
+        result = report[job]
+        print(
+            f"{job:<16} {result['messages_sent']:>6} sent {result['sends_per_second']:>8.1f} sends/s"
+            f"  in {result['seconds']:.2f} s"
+        )
+    print(f"leads            {report['leads']}")
+    print(f"pending          {report['pending_after_drain']}")
+    print(f"fake APIs        {report['fake_apis']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--leads", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent webhook requests")
+    parser.add_argument("--scheduler-concurrency", type=int, default=8)
+    parser.add_argument("--reply-ratio", type=float, default=0.5)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--monday-budget", type=int, default=10_000_000)
+    parser.add_argument("--meta-rate", type=float, default=80.0)
+    # Long enough for the outbox to wait out a Monday budget window (60 s)
+    parser.add_argument("--drain-timeout", type=float, default=180.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", type=Path, help="Write the report to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report = asyncio.run(run(args, Path(tmp) / "bench.db"))
+
+    _print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
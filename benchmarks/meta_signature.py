@@ -0,0 +1,181 @@
+"""
+Cost of Meta webhook signature verification.
+
+Times verify_meta_signature for valid, forged and malformed signatures
+against the cost of parsing the same body (parse_meta_messages), across body
+sizes. Then it floods the real /webhook/meta route in-process with signed and
+with forged requests, to show what a rejected request costs end to end.
+
+Usage:
+    python -m benchmarks.meta_signature [--sizes 1 10 100] [--requests 2000] [--json out.json]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import tempfile
+import time
+import timeit
+import uuid
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+APP_SECRET = "bench-app-secret"
+
+
+def _configure_env(db_path: Path) -> None:
+    """Settings for the benchmark run (must be set before src is imported)."""
+    os.environ.update(
+        {
+            "MONDAY_API_KEY": "bench",
+            "MONDAY_BOARD_ID": "1",
+            "META_API_TOKEN": "bench",
+            "META_PHONE_ID": "1",
+            "META_APP_SECRET": APP_SECRET,
+            "DATABASE_URL": f"sqlite+aiosqlite:///{db_path}",
+            "ENVIRONMENT": "production",
+            "LOG_LEVEL": "ERROR",
+        }
+    )
+
+
+def _sign(body: bytes) -> str:
+    return "sha256=" + hmac.new(APP_SECRET.encode(), body, hashlib.sha256).hexdigest()
+
+
+def _meta_body(size_kb: int) -> bytes:
+    """A message payload padded to about size_kb kilobytes (one padded text body)."""
+    payload = {
+        "object": "whatsapp_business_account",
+        "entry": [
+            {
+                "id": "1",
+                "changes": [
+                    {
+                        "field": "messages",
+                        "value": {
+                            "messaging_product": "whatsapp",
+                            "metadata": {"phone_number_id": "1"},
+                            "messages": [
+                                {
+                                    "from": "972500000001",
+                                    "id": f"wamid.in.{uuid.uuid4().hex}",
+                                    "timestamp": "1700000000",
+                                    "type": "text",
+                                    "text": {"body": "x" * max(0, size_kb * 1024 - 300)},
+                                }
+                            ],
+                        },
+                    }
+                ],
+            }
+        ],
+    }
+    return json.dumps(payload).encode()
+
+
+def _per_call_us(func: Any, number: int) -> float:
+    """Best-of-5 time per call in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def micro(sizes: list[int], number: int) -> list[dict[str, Any]]:
+    """Per-call cost of the signature checks versus parsing, by body size."""
+    from src.services.webhook_parser import parse_meta_messages
+    from src.services.webhook_signature import verify_meta_signature
+
+    secret = APP_SECRET.encode()
+    results = []
+    for size_kb in sizes:
+        body = _meta_body(size_kb)
+        valid = _sign(body)
+        forged = valid[:-8] + "00000000"
+        timings = {
+            "valid_us": lambda: verify_meta_signature(body, valid, secret),
+            "forged_us": lambda: verify_meta_signature(body, forged, secret),
+            "missing_us": lambda: verify_meta_signature(body, None, secret),
+            "parse_us": lambda: parse_meta_messages(body),
+        }
+        results.append(
+            {"body_kb": size_kb}
+            | {name: round(_per_call_us(func, number), 2) for name, func in timings.items()}
+        )
+    return results
+
+
+async def flood(requests: int, concurrency: int) -> dict[str, Any]:
+    """Requests/sec through /webhook/meta for signed versus forged requests."""
+    from src.main import app
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(client: httpx.AsyncClient, forged: bool) -> dict[str, Any]:
+        statuses: dict[int, int] = {}
+
+        async def post() -> None:
+            body = _meta_body(1)
+            signature = "sha256=" + "0" * 64 if forged else _sign(body)
+            async with semaphore:
+                response = await client.post(
+                    "/webhook/meta",
+                    content=body,
+                    headers={
+                        "Content-Type": "application/json",
+                        "X-Hub-Signature-256": signature,
+                    },
+                )
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(post() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+        return {
+            "requests_per_second": round(requests / elapsed, 1),
+            "statuses": statuses,
+        }
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://service"
+        ) as client:
+            return {"signed": await run(client, False), "forged": await run(client, True)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100], help="Body KB")
+    parser.add_argument("--number", type=int, default=2000, help="Calls per timing")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--json", type=Path, help="Write the report to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _configure_env(Path(tmp) / "bench.db")
+        report = {
+            "micro": micro(args.sizes, args.number),
+            "requests": asyncio.run(flood(args.requests, args.concurrency)),
+        }
+
+    print(f"{'body':>8} {'valid':>10} {'forged':>10} {'missing':>10} {'parse':>10}  (us/call)")
+    for row in report["micro"]:
+        print(
+            f"{row['body_kb']:>6}KB {row['valid_us']:>10.2f} {row['forged_us']:>10.2f}"
+            f" {row['missing_us']:>10.2f} {row['parse_us']:>10.2f}"
+        )
+    for kind, result in report["requests"].items():
+        print(
+            f"/webhook/meta {kind:<7} {result['requests_per_second']:>8.1f} req/s"
+            f"  {result['statuses']}"
+        )
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark SQLite write throughput with and without the tuned engine profile.
+
+Simulates webhook-style writers (many short transactions) running alongside
+readers, against a fresh temporary database per profile.
+
+Usage:
+    python -m benchmarks.sqlite_writes [--writers 8] [--writes 200] [--readers 4]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.db.models import Base, Lead
+from src.db.session import create_db_engine
+
+PROFILES: dict[str, dict[str, object]] = {
+    "default": {"tuned": False, "pool_size": None},
+    "tuned": {"tuned": True, "pool_size": None},
+    "tuned_single_writer": {"tuned": True, "pool_size": 1},
+}
+
+
+async def _writer(
+    factory: async_sessionmaker[AsyncSession], writer_id: int, writes: int
+) -> tuple[int, int]:
+    """Insert then update leads in short transactions; return (ok, errors)."""
+    ok = errors = 0
+    for i in range(writes):
+        try:
+            async with factory() as session:
+                lead = Lead(
+                    monday_item_id=f"{writer_id}-{i}",
+                    phone_number=f"+9725{writer_id:03d}{i:05d}",
+                    lead_name="Bench",
+                    created_at=datetime.utcnow(),
+                    first_message_due_at=datetime.utcnow(),
+                )
+                session.add(lead)
+                await session.flush()
+                lead.first_message_sent = True
+                await session.commit()
+            ok += 1
+        except OperationalError:
+            errors += 1
+    return ok, errors
+
+
+async def _reader(factory: async_sessionmaker[AsyncSession], stop: asyncio.Event) -> int:
+    """Run pending-lead style reads until stopped; return the number of reads."""
+    reads = 0
+    while not stop.is_set():
+        async with factory() as session:
+            await session.execute(
+                select(func.count()).select_from(Lead).where(Lead.is_done == False)  # noqa: E712
+            )
+        reads += 1
+        await asyncio.sleep(0)
+    return reads
+
+
+async def run_profile(
+    name: str, database_url: str, writers: int, writes: int, readers: int
+) -> None:
+    """Run the workload against one engine profile and print the results."""
+    profile = PROFILES[name]
+    write_engine: AsyncEngine = create_db_engine(
+        database_url, tuned=bool(profile["tuned"]), pool_size=profile["pool_size"]  # type: ignore[arg-type]
+    )
+    read_engine = create_db_engine(database_url, tuned=bool(profile["tuned"]))
+    write_engine.echo = read_engine.echo = False
+
+    async with write_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    write_factory = async_sessionmaker(write_engine, expire_on_commit=False)
+    read_factory = async_sessionmaker(read_engine, expire_on_commit=False)
+
+    stop = asyncio.Event()
+    reader_tasks = [asyncio.create_task(_reader(read_factory, stop)) for _ in range(readers)]
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(_writer(write_factory, writer_id, writes) for writer_id in range(writers))
+    )
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    reads = sum(await asyncio.gather(*reader_tasks))
+    await write_engine.dispose()
+    await read_engine.dispose()
+
+    ok = sum(r[0] for r in results)
+    errors = sum(r[1] for r in results)
+    print(
+        f"{name:<22} writes/s={ok / elapsed:8.1f}  ok={ok:5d}  "
+        f"locked_errors={errors:4d}  reads={reads:6d}  elapsed={elapsed:6.2f}s"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=list(PROFILES))
+    parser.add_argument(
+        "--dir", default=None, help="Directory for the temporary databases (use a real disk)"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        for name in args.profiles:
+            db_path = Path(tmp) / f"{name}.db"
+            await run_profile(
+                name,
+                f"sqlite+aiosqlite:///{db_path}",
+                args.writers,
+                args.writes,
+                args.readers,
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,5 +1,6 @@
 """Application configuration using Pydantic Settings."""
 
+from datetime import date
 from functools import lru_cache
 from typing import Literal
 
@@ -18,30 +19,139 @@ class Settings(BaseSettings):
     # Monday.com
     monday_api_key: str
     monday_board_id: str
+    monday_api_url: str = "https://api.monday.com/v2"  # Override to point at a stand-in server
     monday_phone_column_id: str = "phone"
     monday_status_column_id: str = "status"
+    default_phone_country_code: str = "972"  # Used for national numbers like 050-1234567
+    # Complexity budget tracking (resynced from Monday's responses) and 429 retries
+    monday_complexity_budget_per_minute: int = 1000000
+    monday_default_query_complexity: int = 1000  # Estimate until an operation's cost is observed
+    monday_max_retries: int = 3
+    monday_default_retry_after_seconds: float = 60.0
+    # Coalesce status updates into aliased multi-mutation requests
+    monday_coalesce_status_updates: bool = False
+    monday_status_batch_window_ms: int = 20  # How long updates are buffered before sending
+    monday_status_mutation_complexity: int = 30000  # Estimated cost of one change_column_value
+    monday_max_complexity_per_request: int = 1000000  # Chunk size limit for batched mutations
+    # Transactional outbox: status writes are stored in the same transaction as the
+    # lead change and sent (batched, retried) by a background dispatcher.
+    # Set to false to call Monday inline instead.
+    monday_outbox_enabled: bool = True
+    monday_outbox_batch_size: int = 25
+    monday_outbox_poll_seconds: float = 5.0
+    monday_outbox_max_attempts: int = 10
+    monday_outbox_retry_base_seconds: int = 5
+    monday_outbox_retry_max_seconds: int = 600
+    # Rows left "processing" longer than this (crashed dispatcher) are claimed again
+    monday_outbox_lease_seconds: int = 300
 
     # Meta WhatsApp API
     meta_api_token: str
     meta_phone_id: str
+    meta_api_base_url: str = "https://graph.facebook.com/v18.0"  # Override to point at a stand-in server
+    # App secret used to verify X-Hub-Signature-256 on incoming webhooks
+    # (empty = signatures are not checked)
+    meta_app_secret: str = ""
+    # Send pacing: global messages/sec cap (adaptive on throttling) and per-recipient spacing
+    meta_messages_per_second: float = 20.0
+    meta_min_messages_per_second: float = 1.0
+    meta_per_recipient_spacing_seconds: float = 6.0
+    meta_throttle_backoff_seconds: float = 2.0  # Base pause after a throttling error (doubles)
+    meta_max_retries: int = 3
+
+    # HTTP client pooling (shared clients for Monday and Meta APIs)
+    http_timeout_seconds: float = 30.0
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 10
+    http_keepalive_expiry_seconds: float = 30.0
+    http2_enabled: bool = False  # Requires the "h2" package
+
+    # Webhook ingestion: "inline" processes events inside the request; "queued"
+    # stores the raw event in a durable queue table and returns immediately
+    webhook_ingestion_mode: Literal["inline", "queued"] = "inline"
+    webhook_queue_workers: int = 2
+    webhook_queue_max_attempts: int = 5
+    webhook_queue_poll_seconds: float = 5.0  # Fallback poll when no enqueue signal arrives
+    # Events left "processing" longer than this (crashed worker) are claimed again
+    webhook_queue_lease_seconds: int = 300
+
+    # Webhook deduplication (in-memory TTL LRU backed by the seen_webhook_ids table)
+    webhook_dedup_enabled: bool = True
+    webhook_dedup_cache_size: int = 10000
+    webhook_dedup_ttl_seconds: int = 86400
 
     # Database
     database_url: str = "sqlite+aiosqlite:///./data/leads.db"
 
+    # SQLite tuning (ignored for other databases)
+    sqlite_tuning_enabled: bool = True
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 16384
+    sqlite_mmap_size_bytes: int = 134217728  # 128 MiB
+    # Route writes through a single pooled connection (queued in-process instead
+    # of contending for the SQLite write lock) and reads through a reader pool
+    sqlite_single_writer: bool = False
+    sqlite_writer_pool_timeout_seconds: float = 30.0
+    sqlite_reader_pool_size: int = 5
+
     # Admin
     admin_secret: str = "change-me-in-production"
 
     # App Settings
     environment: Literal["development", "production"] = "development"
     log_level: str = "INFO"
+    # Logging policy (see src/core/logging.py)
+    # Only these fields are kept for the listed events (others are dropped)
+    log_field_allowlists: dict[str, list[str]] = {
+        "monday_webhook_received": ["item_id", "board_id", "event_type", "trigger_uuid"],
+        "meta_webhook_received": ["messages"],
+        "incoming_whatsapp_message": ["from_phone", "type", "message_id"],
+    }
+    log_sample_rates: dict[str, float] = {}  # e.g. {"incoming_whatsapp_message": 0.1}
+    log_max_field_chars: int = 1000  # Longer values are truncated (0 = no cap)
+    log_mask_phones: bool = True  # Keep only the last 4 digits of phone fields
+    log_json_renderer: Literal["auto", "orjson", "json"] = "auto"  # auto = orjson
+    log_queue_enabled: bool = False  # Write logs from a background thread
 
     # Time Window (Israel Time) for sending follow-up messages
     send_window_start_hour: int = 8
     send_window_end_hour: int = 21
+    # Per-weekday overrides as {weekday: [start_hour, end_hour]} (Monday=0 ... Sunday=6).
+    # An empty list closes the day, e.g. {"4": [8, 14], "5": []} for Friday and Shabbat.
+    send_window_weekday_hours: dict[int, list[int]] = {}
+    send_window_holidays: list[date] = []  # Closed dates (Israel Time), e.g. ["2026-09-12"]
 
     # Message scheduling
     initial_message_delay_minutes: int = 6  # Delay before sending first message
     scheduler_interval_minutes: int = 1  # How often scheduler runs (1-2 min for accuracy)
+    scheduler_max_concurrency: int = 1  # Leads processed in parallel per batch (1 = serial)
+    # Due leads are loaded in keyset pages of this size; each page commits on its own
+    scheduler_page_size: int = 200
+    # When scheduler progress is committed: "lead" = each lead in its own short
+    # transaction, "every_n" = every scheduler_commit_every_n leads,
+    # "time_slice" = every scheduler_commit_interval_seconds, "page" = once per page
+    scheduler_commit_strategy: Literal["lead", "every_n", "time_slice", "page"] = "lead"
+    scheduler_commit_every_n: int = 20
+    scheduler_commit_interval_seconds: float = 2.0
+    # Due leads are claimed with a lease (UPDATE ... RETURNING) so several workers
+    # or replicas can share the send workload without double-sending
+    scheduler_claim_leads: bool = True
+    scheduler_lease_seconds: int = 300
+    scheduler_worker_id: str = ""  # Defaults to "<hostname>:<pid>"
+    # Run the scheduler only in the instance holding a renewed DB lease; the
+    # others stay passive and take over once the leader's lease expires
+    scheduler_leader_election: bool = False
+    scheduler_leader_lease_seconds: float = 15.0
+    scheduler_leader_renew_seconds: float = 5.0
+    # Failed sends are retried with exponential backoff + jitter, then dead-lettered
+    lead_max_attempts: int = 5
+    lead_retry_base_seconds: int = 60
+    lead_retry_max_seconds: int = 3600
+    # "interval" polls the DB every scheduler_interval_minutes; "event" sleeps
+    # until the next known due time (or send window opening)
+    scheduler_mode: Literal["interval", "event"] = "interval"
 
     # WhatsApp Template Names (must be approved in Meta Business)
     whatsapp_welcome_template: str = "hello_world"
@@ -16,7 +16,15 @@ class MondayAPIError(LeadAutomationError):
 class MetaAPIError(LeadAutomationError):
     """Error communicating with Meta WhatsApp API."""
 
-    pass
+    def __init__(
+        self,
+        message: str,
+        error_code: int | None = None,
+        status_code: int | None = None,
+    ) -> None:
+        super().__init__(message)
+        self.error_code = error_code  # Meta "error.code", e.g. 131056
+        self.status_code = status_code
 
 
 class WebhookValidationError(LeadAutomationError):
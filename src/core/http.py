@@ -0,0 +1,44 @@
+"""Shared HTTP client factory for external API services."""
+
+import httpx
+
+from src.core.config import get_settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def _http2_available() -> bool:
+    """Check whether the optional "h2" package is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_http_client(headers: dict[str, str] | None = None) -> httpx.AsyncClient:
+    """
+    Create a long-lived AsyncClient with keep-alive connection pooling.
+
+    Pool limits, timeout and HTTP/2 are taken from settings. HTTP/2 falls back
+    to HTTP/1.1 when the "h2" package is not installed.
+    """
+    settings = get_settings()
+
+    http2 = settings.http2_enabled
+    if http2 and not _http2_available():
+        logger.warning("http2_unavailable", reason="h2 package not installed")
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry_seconds,
+    )
+    return httpx.AsyncClient(
+        headers=headers,
+        limits=limits,
+        timeout=settings.http_timeout_seconds,
+        http2=http2,
+    )
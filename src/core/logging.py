@@ -1,28 +1,177 @@
 """Logging configuration using structlog."""
 
+import json
 import logging
+import logging.handlers
+import queue
+import random
 import sys
+from collections.abc import Callable
+from typing import Any
 
+import orjson
 import structlog
 
 from src.core.config import get_settings
 
+# Fields every event keeps, whatever its allow-list
+BASE_FIELDS = {"event", "level", "logger", "timestamp", "exc_info", "stack_info"}
+# Fields holding phone numbers (masked by the phone processor)
+PHONE_FIELDS = {"phone", "phone_number", "from_phone", "to_phone"}
 
-def setup_logging() -> None:
-    """Configure structured logging for the application."""
-    settings = get_settings()
+_queue_listener: logging.handlers.QueueListener | None = None
 
-    # Configure standard library logging
+
+def _sample_events(rates: dict[str, float]) -> structlog.types.Processor:
+    """Drop a share of high-volume events (rate = fraction kept)."""
+
+    def processor(logger: Any, method_name: str, event_dict: Any) -> Any:
+        rate = rates.get(event_dict.get("event"))
+        if rate is not None and random.random() >= rate:
+            raise structlog.DropEvent
+        return event_dict
+
+    return processor
+
+
+def _allowlist_fields(allowlists: dict[str, list[str]]) -> structlog.types.Processor:
+    """Keep only allow-listed fields for events that have an allow-list."""
+    allowed = {event: BASE_FIELDS | set(fields) for event, fields in allowlists.items()}
+
+    def processor(logger: Any, method_name: str, event_dict: Any) -> Any:
+        keep = allowed.get(event_dict.get("event"))
+        if keep is None:
+            return event_dict
+        return {key: value for key, value in event_dict.items() if key in keep}
+
+    return processor
+
+
+def _mask_phones(logger: Any, method_name: str, event_dict: Any) -> Any:
+    """Mask phone fields down to their last 4 digits."""
+    for key in PHONE_FIELDS.intersection(event_dict):
+        value = event_dict[key]
+        if isinstance(value, str) and len(value) > 4:
+            event_dict[key] = "*" * (len(value) - 4) + value[-4:]
+    return event_dict
+
+
+def _approx_json_size(value: Any, budget: int) -> int:
+    """Rough serialized size of a value; stops counting once it passes budget."""
+    if isinstance(value, str):
+        return len(value) + 2
+    if isinstance(value, (int, float, bool)) or value is None:
+        return 8
+    if isinstance(value, dict):
+        size = 2
+        for key, item in value.items():
+            size += len(str(key)) + 4 + _approx_json_size(item, budget - size)
+            if size > budget:
+                break
+        return size
+    if isinstance(value, (list, tuple)):
+        size = 2
+        for item in value:
+            size += 2 + _approx_json_size(item, budget - size)
+            if size > budget:
+                break
+        return size
+    return len(str(value)) + 2
+
+
+def _cap_field_size(max_chars: int) -> structlog.types.Processor:
+    """Truncate long strings and replace oversized nested values with a preview."""
+    # Containers are only serialized when a cheap estimate gets near the cap
+    # (with a margin for escaping)
+    estimate_budget = max_chars // 2
+
+    def truncate(text: str) -> str:
+        return f"{text[:max_chars]}...(+{len(text) - max_chars} chars)"
+
+    def processor(logger: Any, method_name: str, event_dict: Any) -> Any:
+        for key, value in event_dict.items():
+            if isinstance(value, str):
+                if len(value) > max_chars:
+                    event_dict[key] = truncate(value)
+            elif (
+                isinstance(value, (dict, list, tuple))
+                and _approx_json_size(value, estimate_budget) > estimate_budget
+            ):
+                text = json.dumps(value, default=str, ensure_ascii=False)
+                if len(text) > max_chars:
+                    event_dict[key] = truncate(text)
+        return event_dict
+
+    return processor
+
+
+def _json_serializer(choice: str) -> Callable[..., str]:
+    """orjson-backed serializer (the stdlib json module when the renderer is "json")."""
+    if choice == "json":
+        return json.dumps
+
+    def dumps(obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(
+            obj, default=kwargs.get("default"), option=orjson.OPT_NON_STR_KEYS
+        ).decode()
+
+    return dumps
+
+
+def _configure_handler(level: int, queued: bool) -> None:
+    """Send stdlib logging to stdout, optionally through a background thread."""
+    global _queue_listener
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    if not queued:
+        logging.basicConfig(
+            format="%(message)s", handlers=[stream_handler], level=level, force=True
+        )
+        return
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
     logging.basicConfig(
         format="%(message)s",
-        stream=sys.stdout,
-        level=getattr(logging, settings.log_level.upper()),
+        handlers=[logging.handlers.QueueHandler(log_queue)],
+        level=level,
+        force=True,
     )
+    _queue_listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _queue_listener.start()
+
+
+def setup_logging() -> None:
+    """
+    Configure structured logging for the application.
+
+    The logging policy from settings is applied before rendering: per-event
+    sampling, per-event field allow-lists, phone masking and a field size
+    cap. Production output is rendered as JSON (with orjson, unless
+    log_json_renderer is "json") and can be written by a background thread
+    (log_queue_enabled), so stdout writes never block the event loop.
+    """
+    settings = get_settings()
+
+    # Configure standard library logging
+    _configure_handler(getattr(logging, settings.log_level.upper()), settings.log_queue_enabled)
 
     # Configure structlog
-    processors = [
+    processors: list[structlog.types.Processor] = [
         structlog.contextvars.merge_contextvars,
         structlog.stdlib.filter_by_level,
+    ]
+    if settings.log_sample_rates:
+        processors.append(_sample_events(settings.log_sample_rates))
+    if settings.log_field_allowlists:
+        processors.append(_allowlist_fields(settings.log_field_allowlists))
+    if settings.log_mask_phones:
+        processors.append(_mask_phones)
+    if settings.log_max_field_chars > 0:
+        processors.append(_cap_field_size(settings.log_max_field_chars))
+
+    processors += [
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
@@ -33,7 +182,11 @@ def setup_logging() -> None:
     if settings.environment == "development":
         processors.append(structlog.dev.ConsoleRenderer(colors=True))
     else:
-        processors.append(structlog.processors.JSONRenderer())
+        processors.append(
+            structlog.processors.JSONRenderer(
+                serializer=_json_serializer(settings.log_json_renderer)
+            )
+        )
 
     structlog.configure(
         processors=processors,
@@ -44,6 +197,17 @@ def setup_logging() -> None:
     )
 
 
+def shutdown_logging() -> None:
+    """Flush and stop the background log writer, if one is running."""
+    global _queue_listener
+
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+        # Later records (e.g. from other shutdown hooks) go straight to stdout
+        _configure_handler(logging.getLogger().level, queued=False)
+
+
 def get_logger(name: str) -> structlog.stdlib.BoundLogger:
     """Get a logger instance with the given name."""
     return structlog.get_logger(name)
@@ -0,0 +1,66 @@
+"""Prometheus metrics for the hot paths."""
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+# External API latency (seconds); wide buckets cover budget / rate-limit waits
+API_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+MONDAY_REQUEST_SECONDS = Histogram(
+    "monday_api_request_seconds",
+    "Monday.com GraphQL request latency, including budget and rate-limit waits",
+    ["operation", "outcome"],
+    buckets=API_LATENCY_BUCKETS,
+)
+
+MONDAY_COMPLEXITY_REMAINING = Gauge(
+    "monday_complexity_remaining",
+    "Monday.com complexity budget left in the current minute, as last reported by Monday",
+)
+
+META_SEND_SECONDS = Histogram(
+    "meta_send_seconds",
+    "WhatsApp Cloud API send request latency",
+    ["outcome"],
+    buckets=API_LATENCY_BUCKETS,
+)
+META_SENDS_TOTAL = Counter(
+    "meta_sends_total",
+    "WhatsApp Cloud API send requests by outcome and Meta error code",
+    ["outcome", "error_code"],
+)
+
+WEBHOOK_REQUEST_SECONDS = Histogram(
+    "webhook_request_seconds",
+    "Webhook handler duration",
+    ["source"],
+)
+WEBHOOK_REJECTED_TOTAL = Counter(
+    "webhook_rejected_total",
+    "Webhook requests rejected before processing",
+    ["source", "reason"],
+)
+
+SCHEDULER_JOB_SECONDS = Histogram(
+    "scheduler_job_seconds",
+    "Scheduler job run duration",
+    ["job"],
+    buckets=API_LATENCY_BUCKETS + (120.0, 300.0, 600.0),
+)
+SCHEDULER_BATCH_SIZE = Histogram(
+    "scheduler_batch_size",
+    "Leads per scheduler batch",
+    ["job"],
+    buckets=(1, 5, 10, 25, 50, 100, 200, 500, 1000),
+)
+SCHEDULER_LEADS_TOTAL = Counter(
+    "scheduler_leads_processed_total",
+    "Leads processed by scheduler jobs",
+    ["job", "outcome"],
+)
+
+PENDING_LEADS = Gauge(
+    "pending_leads",
+    "Lead backlog: due initial messages, due follow-ups, pending leads whose send time"
+    " falls outside the send window, and dead-lettered leads",
+    ["kind"],
+)
@@ -0,0 +1,23 @@
+"""Phone number normalization."""
+
+import re
+
+DEFAULT_COUNTRY_CODE = "972"
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+def normalize_phone(phone: str, default_country_code: str = DEFAULT_COUNTRY_CODE) -> str:
+    """
+    Normalize a phone number to E.164 digits without the leading "+".
+
+    Meta sends sender numbers in this form (e.g. "972501234567"), so this is
+    the canonical key for matching replies to leads. Handles "+", "00"
+    international prefixes, separators, and national numbers with a leading 0.
+    """
+    digits = _NON_DIGITS.sub("", phone)
+    if digits.startswith("00"):
+        return digits[2:]
+    if digits.startswith("0") and not phone.strip().startswith("+"):
+        return default_country_code + digits[1:]
+    return digits
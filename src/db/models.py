@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Index, Integer, String
+from sqlalchemy import Boolean, DateTime, Index, Integer, String, Text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -20,6 +20,8 @@ class Lead(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     monday_item_id: Mapped[str] = mapped_column(String, unique=True, index=True)
     phone_number: Mapped[str] = mapped_column(String)
+    # Canonical E.164 digits without "+" (matches Meta's sender format)
+    phone_e164: Mapped[str | None] = mapped_column(String, nullable=True)
     lead_name: Mapped[str] = mapped_column(String)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     status: Mapped[str] = mapped_column(String, default="לייד חדש")
@@ -32,10 +34,99 @@ class Lead(Base):
     followup_due_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     is_done: Mapped[bool] = mapped_column(Boolean, default=False)
 
+    # Retry state for failed sends (exponential backoff, then dead letter)
+    attempt_count: Mapped[int] = mapped_column(Integer, default=0)
+    next_attempt_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    dead_lettered_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    # Claim lease: the scheduler worker currently processing the lead
+    claimed_by: Mapped[str | None] = mapped_column(String, nullable=True)
+    lease_until: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
     __table_args__ = (
         Index("ix_leads_followup_due_is_done", "followup_due_at", "is_done"),
         Index("ix_leads_first_message_due", "first_message_due_at", "first_message_sent"),
+        Index("ix_leads_phone_e164_is_done", "phone_e164", "is_done"),
     )
 
     def __repr__(self) -> str:
         return f"<Lead(id={self.id}, monday_item_id={self.monday_item_id}, status={self.status})>"
+
+
+class WebhookEvent(Base):
+    """Raw webhook event stored by the ingestion queue until it is processed."""
+
+    __tablename__ = "webhook_events"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    source: Mapped[str] = mapped_column(String)  # "monday" or "meta"
+    payload: Mapped[str] = mapped_column(Text)
+    status: Mapped[str] = mapped_column(String, default="pending")
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    # Not claimable before this time (retry backoff)
+    next_attempt_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    claimed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_webhook_events_status_id", "status", "id"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<WebhookEvent(id={self.id}, source={self.source}, status={self.status})>"
+
+
+class SeenWebhookId(Base):
+    """Webhook delivery ID already ingested (Monday trigger UUID / Meta message ID)."""
+
+    __tablename__ = "seen_webhook_ids"
+
+    key: Mapped[str] = mapped_column(String, primary_key=True)  # "<source>:<id>"
+    seen_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self) -> str:
+        return f"<SeenWebhookId(key={self.key})>"
+
+
+class MondayStatusOutbox(Base):
+    """Monday status write recorded with the lead change, sent later by the outbox dispatcher."""
+
+    __tablename__ = "monday_status_outbox"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    monday_item_id: Mapped[str] = mapped_column(String)
+    status: Mapped[str] = mapped_column(String)
+    column_id: Mapped[str] = mapped_column(String)
+    state: Mapped[str] = mapped_column(String, default="pending")  # pending / processing / failed
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    claimed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_monday_status_outbox_state_next_attempt", "state", "next_attempt_at"),
+        Index("ix_monday_status_outbox_item_column", "monday_item_id", "column_id"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<MondayStatusOutbox(id={self.id}, monday_item_id={self.monday_item_id}, "
+            f"status={self.status}, state={self.state})>"
+        )
+
+
+class LeaderLock(Base):
+    """Lease-based lock electing a single active instance (e.g. the scheduler leader)."""
+
+    __tablename__ = "leader_locks"
+
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    holder: Mapped[str] = mapped_column(String)
+    lease_until: Mapped[datetime] = mapped_column(DateTime)
+    acquired_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<LeaderLock(name={self.name}, holder={self.holder}, lease_until={self.lease_until})>"
@@ -2,16 +2,96 @@
 
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.core.config import get_settings
 
 settings = get_settings()
 
-engine = create_async_engine(
+
+def _is_sqlite(database_url: str) -> bool:
+    """Check if the database URL points to SQLite."""
+    return database_url.startswith("sqlite")
+
+
+def _is_sqlite_memory(database_url: str) -> bool:
+    """Check if the database URL points to an in-memory SQLite database."""
+    return _is_sqlite(database_url) and (
+        ":memory:" in database_url or database_url.rstrip("/").endswith(":")
+    )
+
+
+def _apply_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    """Apply the tuned SQLite pragmas to every new connection."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+    cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    # Negative cache_size is in KiB rather than pages
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kib)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size_bytes)}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def create_db_engine(
+    database_url: str,
+    tuned: bool = True,
+    pool_size: int | None = None,
+) -> AsyncEngine:
+    """
+    Create an async engine, applying the SQLite tuning profile when enabled.
+
+    pool_size=1 gives a single-connection writer engine: concurrent writers
+    queue on the pool instead of contending for the SQLite write lock.
+
+    File SQLite databases always use a queue pool: older SQLAlchemy 2.0
+    releases default aiosqlite to NullPool, which rejects the pool arguments
+    and would reconnect (and re-run the PRAGMAs) for every session.
+    """
+    engine_kwargs: dict[str, Any] = {
+        "echo": settings.environment == "development",
+    }
+    if _is_sqlite(database_url) and not _is_sqlite_memory(database_url):
+        engine_kwargs["poolclass"] = AsyncAdaptedQueuePool
+    if pool_size is not None and not _is_sqlite_memory(database_url):
+        engine_kwargs["pool_size"] = pool_size
+        engine_kwargs["max_overflow"] = 0
+        engine_kwargs["pool_timeout"] = settings.sqlite_writer_pool_timeout_seconds
+
+    db_engine = create_async_engine(database_url, **engine_kwargs)
+
+    if tuned and _is_sqlite(database_url):
+        event.listen(db_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+
+    return db_engine
+
+
+_tuned = settings.sqlite_tuning_enabled
+_single_writer = settings.sqlite_single_writer and _is_sqlite(settings.database_url)
+
+engine = create_db_engine(
     settings.database_url,
-    echo=settings.environment == "development",
+    tuned=_tuned,
+    pool_size=1 if _single_writer else None,
+)
+read_engine = (
+    create_db_engine(
+        settings.database_url,
+        tuned=_tuned,
+        pool_size=settings.sqlite_reader_pool_size,
+    )
+    if _single_writer
+    else engine
 )
 
 async_session_factory = async_sessionmaker(
@@ -20,6 +100,12 @@ async_session_factory = async_sessionmaker(
     expire_on_commit=False,
 )
 
+read_session_factory = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
 
 @asynccontextmanager
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -33,9 +119,23 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             raise
 
 
+@asynccontextmanager
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """Get an async database session for read-only queries (reader pool)."""
+    async with read_session_factory() as session:
+        yield session
+
+
 async def init_db() -> None:
     """Initialize database tables."""
     from src.db.models import Base
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+
+async def close_db() -> None:
+    """Dispose of the engine connection pools."""
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
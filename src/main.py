@@ -4,12 +4,19 @@ from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from fastapi import FastAPI, Header
+from fastapi.responses import Response
 
 from src.core.config import get_settings
-from src.core.logging import get_logger, setup_logging
-from src.db.session import init_db
+from src.core.logging import get_logger, setup_logging, shutdown_logging
+from src.core.metrics import CONTENT_TYPE_LATEST, PENDING_LEADS, generate_latest
+from src.db.session import close_db, get_read_session, init_db
 from src.routers import monday, meta
+from src.services.lead import lead_service
+from src.services.meta import meta_service
+from src.services.monday import monday_service
+from src.services.monday_outbox import monday_outbox
 from src.services.scheduler import scheduler_service
+from src.services.webhook_queue import webhook_queue
 
 settings = get_settings()
 setup_logging()
@@ -20,11 +27,26 @@ logger = get_logger(__name__)
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan handler."""
     logger.info("Starting Lead Automation Service")
+    if not settings.meta_app_secret:
+        logger.warning("meta_webhook_signature_verification_disabled")
 
     # Initialize database
     await init_db()
     logger.info("Database initialized")
 
+    # Open pooled HTTP clients for external APIs
+    await monday_service.start()
+    await meta_service.start()
+    logger.info("HTTP clients started")
+
+    # Start the Monday status outbox dispatcher
+    if settings.monday_outbox_enabled:
+        await monday_outbox.start()
+
+    # Start webhook ingestion consumers
+    if settings.webhook_ingestion_mode == "queued":
+        await webhook_queue.start()
+
     # Start scheduler
     scheduler_service.start()
     logger.info("Scheduler started")
@@ -32,10 +54,26 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     yield
 
     # Stop scheduler
-    scheduler_service.stop()
+    await scheduler_service.stop()
     logger.info("Scheduler stopped")
 
+    # Stop webhook ingestion consumers
+    if settings.webhook_ingestion_mode == "queued":
+        await webhook_queue.stop()
+
+    # Stop the Monday status outbox dispatcher
+    if settings.monday_outbox_enabled:
+        await monday_outbox.stop()
+
+    # Close pooled HTTP clients
+    await monday_service.close()
+    await meta_service.close()
+    logger.info("HTTP clients closed")
+
+    await close_db()
+
     logger.info("Shutting down Lead Automation Service")
+    shutdown_logging()
 
 
 app = FastAPI(
@@ -64,6 +102,21 @@ async def root() -> dict[str, str]:
     return {"message": "Lead Automation Service is running"}
 
 
+@app.get("/metrics")
+async def metrics() -> Response:
+    """
+    Prometheus metrics (API latencies, webhook and scheduler timings, lead backlog).
+
+    Backlog gauges are refreshed from the DB on each scrape.
+    """
+    async with get_read_session() as session:
+        backlog = await lead_service.get_backlog_counts(session)
+    for kind, count in backlog.items():
+        PENDING_LEADS.labels(kind=kind).set(count)
+
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.post("/admin/trigger-scheduler")
 async def trigger_scheduler(x_admin_secret: str = Header(None, alias="X-Admin-Secret")) -> dict[str, str]:
     """
@@ -5,15 +5,20 @@ from fastapi.responses import PlainTextResponse, JSONResponse
 
 from src.core.config import get_settings
 from src.core.logging import get_logger
-from src.db.session import get_session
-from src.services.lead import lead_service
-from src.services.monday import STATUS_CUSTOMER_REPLIED, monday_service
+from src.core.metrics import WEBHOOK_REJECTED_TOTAL, WEBHOOK_REQUEST_SECONDS
+from src.services.dedup import webhook_deduplicator
+from src.services.webhook import SOURCE_META, webhook_service
+from src.services.webhook_parser import dump_meta_messages, parse_meta_messages
+from src.services.webhook_queue import webhook_queue
+from src.services.webhook_signature import META_SIGNATURE_HEADER, verify_meta_signature
 
 logger = get_logger(__name__)
 settings = get_settings()
 
 router = APIRouter(prefix="/webhook", tags=["webhooks"])
 
+_app_secret = settings.meta_app_secret.encode("utf-8")
+
 
 @router.get("/meta")
 async def meta_webhook_verify(
@@ -46,63 +51,50 @@ async def meta_webhook(request: Request) -> JSONResponse:
     """
     Handle incoming WhatsApp messages from Meta.
 
-    When a lead replies:
-    1. Find the lead in DB by phone number
-    2. Mark as done
-    3. Update Monday status to indicate reply received
+    Replies are processed inline, or queued for a background consumer in
+    "queued" ingestion mode (see WebhookService.process_meta_messages).
 
-    Always returns 200 to acknowledge receipt.
+    When META_APP_SECRET is set, requests without a valid X-Hub-Signature-256
+    are rejected with 401; everything else returns 200 to acknowledge receipt.
     """
-    try:
-        body = await request.json()
-        logger.info("meta_webhook_received", body=body)
-
-        # Navigate to messages in the webhook payload
-        entries = body.get("entry", [])
-        for entry in entries:
-            changes = entry.get("changes", [])
-            for change in changes:
-                value = change.get("value", {})
-                messages = value.get("messages", [])
-
-                for message in messages:
-                    sender_phone = message.get("from")
-                    message_type = message.get("type")
-                    message_id = message.get("id")
-
-                    logger.info(
-                        "incoming_whatsapp_message",
-                        from_phone=sender_phone,
-                        type=message_type,
-                        message_id=message_id,
-                    )
-
-                    if not sender_phone:
-                        continue
-
-                    # Process the incoming message
-                    async with get_session() as session:
-                        lead = await lead_service.mark_lead_replied(
-                            session, sender_phone
-                        )
-
-                        if lead:
-                            # Update Monday status to indicate customer replied
-                            try:
-                                await monday_service.update_item_status(
-                                    lead.monday_item_id,
-                                    STATUS_CUSTOMER_REPLIED,
-                                )
-                                logger.info(
-                                    "monday_status_updated_on_reply",
-                                    lead_id=lead.id,
-                                )
-                            except Exception as e:
-                                logger.error(
-                                    "failed_to_update_monday_on_reply",
-                                    error=str(e),
-                                )
+    with WEBHOOK_REQUEST_SECONDS.labels(source=SOURCE_META).time():
+        return await _handle_meta_webhook(request)
 
+
+async def _handle_meta_webhook(request: Request) -> JSONResponse:
+    """Meta webhook handling (timed by meta_webhook)."""
+    try:
+        raw_body = await request.body()
+
+        # Reject unsigned / forged requests before any decoding or DB work
+        if _app_secret and not verify_meta_signature(
+            raw_body, request.headers.get(META_SIGNATURE_HEADER), _app_secret
+        ):
+            WEBHOOK_REJECTED_TOTAL.labels(source=SOURCE_META, reason="bad_signature").inc()
+            logger.warning("meta_webhook_signature_invalid")
+            return JSONResponse(content={"status": "invalid signature"}, status_code=401)
+
+        # Status-only deliveries come back empty without being decoded
+        messages = parse_meta_messages(raw_body)
+        logger.info("meta_webhook_received", messages=len(messages))
+        if not messages:
+            return JSONResponse(content={"status": "received"})
+
+        # Drop redelivered messages before any processing
+        messages = await webhook_deduplicator.filter_new_messages(messages)
+        if not messages:
+            return JSONResponse(content={"status": "received"})
+
+        try:
+            if settings.webhook_ingestion_mode == "queued":
+                await webhook_queue.enqueue(SOURCE_META, dump_meta_messages(messages))
+                return JSONResponse(content={"status": "queued"})
+
+            await webhook_service.process_meta_messages(messages)
+        except Exception:
+            # Not ingested: let redeliveries of these messages through
+            await webhook_deduplicator.forget(SOURCE_META, [message.id for message in messages])
+            raise
         return JSONResponse(content={"status": "received"})
 
     except Exception as e:
@@ -1,16 +1,20 @@
 """Monday.com webhook router."""
 
-from typing import Any
-
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
+from pydantic import ValidationError
 
+from src.core.config import get_settings
 from src.core.logging import get_logger
-from src.db.session import get_session
-from src.schemas.monday import MondayWebhookPayload
-from src.services.lead import lead_service
+from src.core.metrics import WEBHOOK_REQUEST_SECONDS
+from src.schemas.monday import MondayWebhookChallenge
+from src.services.dedup import webhook_deduplicator
+from src.services.webhook import SOURCE_MONDAY, webhook_service
+from src.services.webhook_parser import parse_monday_payload
+from src.services.webhook_queue import webhook_queue
 
 logger = get_logger(__name__)
+settings = get_settings()
 
 router = APIRouter(prefix="/webhook", tags=["webhooks"])
 
@@ -22,49 +26,55 @@ async def monday_webhook(request: Request) -> JSONResponse:
 
     Handles:
     - Challenge verification (for webhook setup)
-    - New item creation events
+    - New item creation events (processed inline, or queued in "queued" ingestion mode)
 
     Always returns 200 to prevent retries per STANDARDS.md.
     """
-    try:
-        body = await request.json()
-        logger.info("monday_webhook_received", body=body)
+    with WEBHOOK_REQUEST_SECONDS.labels(source=SOURCE_MONDAY).time():
+        return await _handle_monday_webhook(request)
 
-        # Handle challenge verification
-        if "challenge" in body:
-            logger.info("monday_challenge_received")
-            return JSONResponse(content={"challenge": body["challenge"]})
 
-        # Parse webhook payload
+async def _handle_monday_webhook(request: Request) -> JSONResponse:
+    """Monday webhook handling (timed by monday_webhook)."""
+    try:
+        raw_body = await request.body()
         try:
-            payload = MondayWebhookPayload(**body)
-        except Exception as e:
+            payload = parse_monday_payload(raw_body)
+        except ValidationError as e:
             logger.error("invalid_webhook_payload", error=str(e))
-            return JSONResponse(content={"status": "invalid payload"}, status_code=200)
+            return JSONResponse(content={"status": "invalid payload"})
 
-        event = payload.event
-        item_id = str(event.pulseId)
+        # Handle challenge verification
+        if isinstance(payload, MondayWebhookChallenge):
+            logger.info("monday_challenge_received")
+            return JSONResponse(content={"challenge": payload.challenge})
 
+        event = payload.event
         logger.info(
-            "processing_monday_event",
-            item_id=item_id,
+            "monday_webhook_received",
+            item_id=event.pulseId,
             board_id=event.boardId,
-            group_id=event.groupId,
+            event_type=event.type,
+            trigger_uuid=event.originalTriggerUuid,
         )
 
-        # Process the new lead
-        async with get_session() as session:
-            try:
-                await lead_service.process_new_lead(session, item_id)
-                return JSONResponse(content={"status": "processed"})
-            except ValueError as e:
-                # Lead already exists or missing data
-                logger.warning("lead_processing_skipped", error=str(e))
-                return JSONResponse(content={"status": "skipped", "reason": str(e)})
-            except Exception as e:
-                logger.error("lead_processing_failed", error=str(e))
-                # Return 200 to prevent retries
-                return JSONResponse(content={"status": "error", "reason": str(e)})
+        # Drop redeliveries before any processing
+        trigger_uuid = event.originalTriggerUuid
+        if await webhook_deduplicator.is_duplicate(SOURCE_MONDAY, trigger_uuid):
+            logger.info("duplicate_monday_event_dropped", trigger_uuid=trigger_uuid)
+            return JSONResponse(content={"status": "duplicate"})
+
+        try:
+            if settings.webhook_ingestion_mode == "queued":
+                event_id = await webhook_queue.enqueue(SOURCE_MONDAY, raw_body.decode("utf-8"))
+                return JSONResponse(content={"status": "queued", "event_id": event_id})
+
+            result = await webhook_service.process_monday_event(event, raise_errors=True)
+        except Exception:
+            # Not ingested: let a redelivery of this event through
+            await webhook_deduplicator.forget(SOURCE_MONDAY, [trigger_uuid])
+            raise
+        return JSONResponse(content=result)
 
     except Exception as e:
         logger.error("webhook_handler_error", error=str(e))
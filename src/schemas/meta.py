@@ -2,35 +2,33 @@
 
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class MetaWebhookMessage(BaseModel):
     """Individual message in Meta webhook payload."""
 
-    from_: str | None = None  # sender phone number
-    id: str
-    timestamp: str
-    type: str
-    text: dict[str, str] | None = None
+    model_config = ConfigDict(populate_by_name=True)
 
-    class Config:
-        populate_by_name = True
-        fields = {"from_": "from"}
+    from_: str | None = Field(default=None, alias="from")  # sender phone number
+    id: str | None = None
+    timestamp: str | None = None
+    type: str | None = None
+    text: dict[str, Any] | None = None
 
 
 class MetaWebhookContact(BaseModel):
     """Contact information in Meta webhook."""
 
-    profile: dict[str, str] | None = None
-    wa_id: str
+    profile: dict[str, Any] | None = None
+    wa_id: str | None = None
 
 
 class MetaWebhookValue(BaseModel):
     """Value object in Meta webhook changes."""
 
-    messaging_product: str
-    metadata: dict[str, str]
+    messaging_product: str = "whatsapp"
+    metadata: dict[str, Any] | None = None
     contacts: list[MetaWebhookContact] | None = None
     messages: list[MetaWebhookMessage] | None = None
     statuses: list[dict[str, Any]] | None = None
@@ -40,34 +38,28 @@ class MetaWebhookChange(BaseModel):
     """Change object in Meta webhook."""
 
     value: MetaWebhookValue
-    field: str
+    field: str | None = None
 
 
 class MetaWebhookEntry(BaseModel):
     """Entry object in Meta webhook payload."""
 
-    id: str
-    changes: list[MetaWebhookChange]
+    id: str | None = None
+    changes: list[MetaWebhookChange] = []
 
 
 class MetaWebhookPayload(BaseModel):
     """Full Meta WhatsApp webhook payload."""
 
-    object: str
-    entry: list[MetaWebhookEntry]
+    object: str | None = None
+    entry: list[MetaWebhookEntry] = []
 
 
 class MetaWebhookVerification(BaseModel):
     """Meta webhook verification query parameters."""
 
-    hub_mode: str | None = None
-    hub_verify_token: str | None = None
-    hub_challenge: str | None = None
-
-    class Config:
-        populate_by_name = True
-        fields = {
-            "hub_mode": "hub.mode",
-            "hub_verify_token": "hub.verify_token",
-            "hub_challenge": "hub.challenge",
-        }
+    model_config = ConfigDict(populate_by_name=True)
+
+    hub_mode: str | None = Field(default=None, alias="hub.mode")
+    hub_verify_token: str | None = Field(default=None, alias="hub.verify_token")
+    hub_challenge: str | None = Field(default=None, alias="hub.challenge")
@@ -8,6 +8,7 @@ from pydantic import BaseModel
 class MondayWebhookEvent(BaseModel):
     """Monday.com webhook event payload."""
 
+    type: str | None = None  # e.g. "create_pulse"
     userId: int | None = None
     originalTriggerUuid: str | None = None
     boardId: int
@@ -35,3 +36,12 @@ class MondayWebhookChallenge(BaseModel):
     """Monday.com webhook challenge (for verification)."""
 
     challenge: str
+
+
+class MondayLead(BaseModel):
+    """Lead details extracted from a single Monday.com item fetch."""
+
+    item_id: str
+    name: str = ""
+    phone: str | None = None
+    status: str = ""
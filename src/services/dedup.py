@@ -0,0 +1,133 @@
+"""Webhook deduplication - drops redelivered Monday events and Meta messages."""
+
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.sqlite import insert
+
+from src.core.config import get_settings
+from src.core.logging import get_logger
+from src.db.models import SeenWebhookId
+from src.db.session import get_session
+from src.schemas.meta import MetaWebhookMessage
+from src.services.webhook import SOURCE_META
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# How often expired rows are pruned from the seen_webhook_ids table
+PRUNE_INTERVAL_SECONDS = 3600
+
+
+class WebhookDeduplicator:
+    """
+    Detect webhook redeliveries by their provider-assigned IDs.
+
+    A bounded TTL LRU answers repeat deliveries without touching the DB; the
+    seen_webhook_ids table catches duplicates across restarts and processes.
+    """
+
+    def __init__(self) -> None:
+        self._cache: OrderedDict[str, float] = OrderedDict()
+        self._last_prune = 0.0
+
+    def _in_cache(self, key: str, now: float) -> bool:
+        """Check the LRU, evicting the entry if it has expired."""
+        expires_at = self._cache.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= now:
+            del self._cache[key]
+            return False
+        self._cache.move_to_end(key)
+        return True
+
+    def _remember(self, keys: list[str], now: float) -> None:
+        """Add keys to the LRU, evicting the oldest beyond the size limit."""
+        expires_at = now + settings.webhook_dedup_ttl_seconds
+        for key in keys:
+            self._cache[key] = expires_at
+            self._cache.move_to_end(key)
+        while len(self._cache) > settings.webhook_dedup_cache_size:
+            self._cache.popitem(last=False)
+
+    async def filter_new(self, source: str, ids: list[str]) -> set[str]:
+        """
+        Record IDs as seen and return the ones not seen before.
+
+        Cache hits are dropped without a DB round trip. The rest are inserted
+        in one statement, and only the rows it actually inserts (or revives
+        after the TTL) count as new, so concurrent redeliveries of the same ID
+        cannot both get through.
+        """
+        if not settings.webhook_dedup_enabled:
+            return set(ids)
+
+        now = time.monotonic()
+        keys = {f"{source}:{event_id}": event_id for event_id in dict.fromkeys(ids)}
+        candidates = [key for key in keys if not self._in_cache(key, now)]
+        if not candidates:
+            return set()
+
+        seen_at = datetime.utcnow()
+        cutoff = seen_at - timedelta(seconds=settings.webhook_dedup_ttl_seconds)
+        async with get_session() as session:
+            statement = insert(SeenWebhookId).values(
+                [{"key": key, "seen_at": seen_at} for key in candidates]
+            )
+            result = await session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=["key"],
+                    set_={"seen_at": statement.excluded.seen_at},
+                    where=SeenWebhookId.seen_at < cutoff,
+                ).returning(SeenWebhookId.key)
+            )
+            new_keys = list(result.scalars())
+
+            if now - self._last_prune > PRUNE_INTERVAL_SECONDS:
+                self._last_prune = now
+                await session.execute(delete(SeenWebhookId).where(SeenWebhookId.seen_at < cutoff))
+
+        self._remember(candidates, now)
+        return {keys[key] for key in new_keys}
+
+    async def forget(self, source: str, ids: list[str | None]) -> None:
+        """Un-record IDs whose processing failed, so a redelivery is processed again."""
+        keys = [f"{source}:{event_id}" for event_id in ids if event_id]
+        if not settings.webhook_dedup_enabled or not keys:
+            return
+
+        for key in keys:
+            self._cache.pop(key, None)
+        try:
+            async with get_session() as session:
+                await session.execute(delete(SeenWebhookId).where(SeenWebhookId.key.in_(keys)))
+        except Exception as e:
+            logger.error("webhook_dedup_forget_failed", source=source, error=str(e))
+
+    async def is_duplicate(self, source: str, event_id: str | None) -> bool:
+        """Check (and record) a single delivery ID. Missing IDs are never duplicates."""
+        if not event_id:
+            return False
+        return not await self.filter_new(source, [event_id])
+
+    async def filter_new_messages(
+        self, messages: list[MetaWebhookMessage]
+    ) -> list[MetaWebhookMessage]:
+        """Drop already-seen Meta messages (messages without an ID are kept)."""
+        message_ids = [message.id for message in messages if message.id]
+        if not message_ids:
+            return messages
+
+        new_ids = await self.filter_new(SOURCE_META, message_ids)
+        if len(new_ids) < len(set(message_ids)):
+            logger.info(
+                "duplicate_meta_messages_dropped",
+                dropped=len(set(message_ids)) - len(new_ids),
+            )
+        return [message for message in messages if not message.id or message.id in new_ids]
+
+
+webhook_deduplicator = WebhookDeduplicator()
@@ -0,0 +1,71 @@
+"""In-memory min-heap of upcoming lead due times for event-driven scheduling."""
+
+import asyncio
+import heapq
+from datetime import datetime
+
+# Due entry kinds
+DUE_INITIAL_MESSAGE = "initial_message"
+DUE_FOLLOWUP = "followup"
+
+
+class DueQueue:
+    """
+    Min-heap of (due_at, kind) entries that wakes the scheduler when it changes.
+
+    Times are naive UTC, matching the Lead model columns. Pushes are ignored
+    until the queue is enabled, so interval mode does not accumulate entries.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[datetime, str]] = []
+        self._entries: set[tuple[datetime, str]] = set()
+        self._changed = asyncio.Event()
+        self.enabled = False
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, due_at: datetime | None, kind: str) -> None:
+        """Add a due time; wakes the waiter if it becomes the earliest entry."""
+        if not self.enabled or due_at is None:
+            return
+
+        entry = (due_at, kind)
+        if entry in self._entries:
+            return
+
+        heapq.heappush(self._heap, entry)
+        self._entries.add(entry)
+        if self._heap[0] == entry:
+            self._changed.set()
+
+    def peek(self) -> datetime | None:
+        """Return the earliest due time, or None if the queue is empty."""
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> set[str]:
+        """Remove all entries due at or before now and return their kinds."""
+        kinds: set[str] = set()
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            self._entries.discard(entry)
+            kinds.add(entry[1])
+        return kinds
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._heap.clear()
+        self._entries.clear()
+
+    async def wait(self, timeout: float | None) -> None:
+        """Sleep until timeout elapses or an earlier due time is pushed."""
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._changed.clear()
+
+
+due_queue = DueQueue()
@@ -1,20 +1,29 @@
 """Lead processing service - orchestrates the lead automation flow."""
 
+import os
+import random
+import socket
 from datetime import datetime, timedelta
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import Select, and_, func, inspect, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.config import get_settings
 from src.core.exceptions import LeadNotFoundError, MetaAPIError, MondayAPIError
 from src.core.logging import get_logger
+from src.core.phone import normalize_phone
 from src.db.models import Lead
+from src.db.session import get_read_session, get_session
+from src.services.due_queue import DUE_FOLLOWUP, DUE_INITIAL_MESSAGE, due_queue
 from src.services.meta import meta_service
+from src.services.send_window import send_window_calendar
 from src.services.monday import (
     STATUS_MESSAGE_SENT,
     STATUS_NO_ANSWER_1,
     monday_service,
 )
+from src.services.monday_outbox import monday_outbox
 
 logger = get_logger(__name__)
 settings = get_settings()
@@ -34,6 +43,10 @@ FOLLOWUP_MESSAGE = """שלום {name},
 class LeadService:
     """Service for processing leads through the automation flow."""
 
+    def __init__(self) -> None:
+        # Identifies this process in lead claim leases
+        self.worker_id = settings.scheduler_worker_id or f"{socket.gethostname()}:{os.getpid()}"
+
     async def process_new_lead(
         self,
         session: AsyncSession,
@@ -45,8 +58,12 @@ class LeadService:
         Process a new lead from Monday.com webhook.
 
         1. Fetch lead details from Monday
-        2. Store in database with first_message_due_at (delayed by configured minutes)
+        2. Store in database with first_message_due_at (delayed by configured minutes,
+           moved forward to the next send window opening if needed)
         3. Scheduler will send the message when due
+
+        The session is only written to after the Monday call, so with a
+        single-writer pool the writer connection is held just for the commit.
         
         Note: Message is NOT sent immediately - it's scheduled for later.
         """
@@ -60,24 +77,27 @@ class LeadService:
             phone_column_id=phone_column_id,
         )
 
-        # Check if lead already exists
-        existing = await session.execute(
-            select(Lead).where(Lead.monday_item_id == monday_item_id)
-        )
-        if existing.scalar_one_or_none():
+        # Check if lead already exists (on the reader pool: the write session
+        # must not hold its connection while Monday is called)
+        async with get_read_session() as read_session:
+            existing = await read_session.scalar(
+                select(Lead.id).where(Lead.monday_item_id == monday_item_id)
+            )
+        if existing is not None:
             logger.warning("lead_already_exists", monday_item_id=monday_item_id)
             raise ValueError(f"Lead {monday_item_id} already processed")
 
-        # Fetch lead details from Monday
+        # Fetch lead details from Monday (single API call)
         try:
-            phone = await monday_service.get_phone_number_from_item(
-                monday_item_id, phone_column_id
+            monday_lead = await monday_service.get_lead(
+                monday_item_id, phone_column_id, status_column_id
             )
-            name = await monday_service.get_lead_name_from_item(monday_item_id)
         except MondayAPIError as e:
             logger.error("failed_to_fetch_lead", error=str(e))
             raise
 
+        phone = monday_lead.phone
+        name = monday_lead.name
         if not phone:
             logger.error("no_phone_number", monday_item_id=monday_item_id)
             raise ValueError(f"No phone number found for item {monday_item_id}")
@@ -89,15 +109,19 @@ class LeadService:
         lead = Lead(
             monday_item_id=monday_item_id,
             phone_number=phone,
+            phone_e164=normalize_phone(phone, settings.default_phone_country_code),
             lead_name=name or "Unknown",
             created_at=now,
             status="לייד חדש",  # New lead - message not sent yet
-            first_message_due_at=now + timedelta(minutes=delay_minutes),
+            first_message_due_at=send_window_calendar.next_open(
+                now + timedelta(minutes=delay_minutes)
+            ),
             first_message_sent=False,
             followup_due_at=None,  # Will be set after first message is sent
             is_done=False,
         )
         session.add(lead)
+        due_queue.push(lead.first_message_due_at, DUE_INITIAL_MESSAGE)
 
         logger.info(
             "lead_scheduled_for_message",
@@ -119,7 +143,7 @@ class LeadService:
 
         1. Send WhatsApp welcome message
         2. Update Monday status to "נשלחה הודעה"
-        3. Set followup_due_at for 24h later
+        3. Set followup_due_at for 24h later (or the next send window opening)
 
         Returns True if message was sent, False otherwise.
         """
@@ -155,18 +179,20 @@ class LeadService:
 
         # Mark first message as sent
         now = datetime.utcnow()
+        self._clear_retry_state(lead)
         lead.first_message_sent = True
         lead.status = STATUS_MESSAGE_SENT
-        lead.followup_due_at = now + timedelta(hours=24)
+        lead.followup_due_at = send_window_calendar.next_open(now + timedelta(hours=24))
+        due_queue.push(lead.followup_due_at, DUE_FOLLOWUP)
 
         # Update Monday status
-        try:
-            await monday_service.update_item_status(
-                lead.monday_item_id, STATUS_MESSAGE_SENT, status_column_id
-            )
-        except MondayAPIError as e:
-            logger.error("failed_to_update_monday_status", error=str(e))
-            # Message was sent, so continue despite Monday update failure
+        await self.update_monday_status(
+            session,
+            lead.monday_item_id,
+            STATUS_MESSAGE_SENT,
+            status_column_id,
+            error_event="failed_to_update_monday_status",
+        )
 
         logger.info(
             "initial_message_sent_successfully",
@@ -177,44 +203,85 @@ class LeadService:
         return True
 
     async def get_leads_pending_initial_message(
-        self, session: AsyncSession
+        self,
+        session: AsyncSession,
+        limit: int | None = None,
+        after: tuple[datetime, int] | None = None,
     ) -> list[Lead]:
-        """Get all leads that are due for initial message sending."""
+        """
+        Get leads that are due for initial message sending, ordered by (due time, id).
+
+        Args:
+            limit: Page size (None = all due leads)
+            after: Keyset cursor - (first_message_due_at, id) of the last lead
+                of the previous page
+        """
         now = datetime.utcnow()
         result = await session.execute(
-            select(Lead).where(
-                Lead.first_message_sent == False,  # noqa: E712
-                Lead.first_message_due_at <= now,
-                Lead.is_done == False,  # noqa: E712
+            self._keyset_page(
+                select(Lead).where(*self._pending_initial_filters(now)),
+                Lead.first_message_due_at,
+                limit,
+                after,
             )
         )
         return list(result.scalars().all())
 
+    async def claim_leads_pending_initial_message(
+        self,
+        session: AsyncSession,
+        limit: int | None = None,
+        after: tuple[datetime, int] | None = None,
+    ) -> list[Lead]:
+        """Claim (lease) the next page of leads due for initial message sending."""
+        return await self._claim(
+            session,
+            self._pending_initial_filters(datetime.utcnow()),
+            Lead.first_message_due_at,
+            limit,
+            after,
+        )
+
+    @classmethod
+    def _pending_initial_filters(cls, now: datetime) -> list[Any]:
+        """Filters for leads due for their initial message."""
+        return [
+            Lead.first_message_sent == False,  # noqa: E712
+            Lead.first_message_due_at <= now,
+            Lead.is_done == False,  # noqa: E712
+            *cls._retry_ready(now),
+        ]
+
     async def process_followup(
         self,
         session: AsyncSession,
         lead: Lead,
-        status_column_id: str = "status",
+        status_column_id: str | None = None,
+        current_status: str | None = None,
     ) -> bool:
         """
         Process 24h follow-up for a lead.
 
         1. Safety Check: Query Monday for current status
+           (skipped if current_status was already fetched in bulk)
         2. If status is "נשלחה הודעה" -> Send follow-up
         3. Update Monday status to "אין מענה 1"
 
         Returns True if follow-up was sent, False if aborted.
         """
+        status_column_id = status_column_id or settings.monday_status_column_id
+
         logger.info("processing_followup", lead_id=lead.id)
 
         # Safety Check: Query Monday for current status
-        try:
-            current_status = await monday_service.get_item_status(
-                lead.monday_item_id, status_column_id
-            )
-        except MondayAPIError as e:
-            logger.error("safety_check_failed", error=str(e))
-            raise
+        if current_status is None:
+            try:
+                current_status = await monday_service.get_item_status(
+                    lead.monday_item_id, status_column_id
+                )
+            except MondayAPIError as e:
+                logger.error("safety_check_failed", error=str(e))
+                raise
 
         # Abort if status changed (human intervention occurred)
         if current_status != STATUS_MESSAGE_SENT:
@@ -253,15 +320,16 @@ class LeadService:
             raise
 
         # Update Monday status to "אין מענה 1"
-        try:
-            await monday_service.update_item_status(
-                lead.monday_item_id, STATUS_NO_ANSWER_1, status_column_id
-            )
-        except MondayAPIError as e:
-            logger.error("failed_to_update_monday_followup", error=str(e))
-            # Continue - message was sent
+        await self.update_monday_status(
+            session,
+            lead.monday_item_id,
+            STATUS_NO_ANSWER_1,
+            status_column_id,
+            error_event="failed_to_update_monday_followup",
+        )
 
         # Update lead status in DB
+        self._clear_retry_state(lead)
         lead.status = STATUS_NO_ANSWER_1
         lead.is_done = True
 
@@ -278,14 +346,12 @@ class LeadService:
 
         Returns the lead if found and updated, None otherwise.
         """
-        # Normalize phone number for lookup
-        # Meta sends without +, we store with +, so try both formats
-        normalized = phone_number.lstrip("+")
-        phone_with_plus = f"+{normalized}"
+        # Normalize phone number for an index seek on (phone_e164, is_done)
+        normalized = normalize_phone(phone_number, settings.default_phone_country_code)
 
         result = await session.execute(
             select(Lead).where(
-                Lead.phone_number.in_([normalized, phone_with_plus, phone_number]),
+                Lead.phone_e164 == normalized,
                 Lead.is_done == False,  # noqa: E712
             )
         )
@@ -299,20 +365,388 @@ class LeadService:
         logger.warning("no_active_lead_for_reply", phone=phone_number)
         return None
 
+    async def mark_leads_replied(
+        self,
+        session: AsyncSession,
+        phone_numbers: list[str],
+    ) -> list[Lead]:
+        """
+        Mark all active leads matching any of the given sender phones as replied.
+
+        Resolves the leads with one IN query and marks them done with one bulk
+        UPDATE. Returns the leads that were updated.
+        """
+        normalized = {
+            normalize_phone(phone, settings.default_phone_country_code)
+            for phone in phone_numbers
+        }
+        if not normalized:
+            return []
+
+        result = await session.execute(
+            select(Lead).where(
+                Lead.phone_e164.in_(normalized),
+                Lead.is_done == False,  # noqa: E712
+            )
+        )
+        leads = list(result.scalars().all())
+
+        if leads:
+            await session.execute(
+                update(Lead)
+                .where(Lead.id.in_([lead.id for lead in leads]))
+                .values(is_done=True)
+            )
+
+        matched = {lead.phone_e164 for lead in leads}
+        logger.info(
+            "leads_marked_replied",
+            lead_ids=[lead.id for lead in leads],
+            unmatched=len(normalized - matched),
+        )
+        return leads
+
     async def get_leads_pending_followup(
-        self, session: AsyncSession
+        self,
+        session: AsyncSession,
+        limit: int | None = None,
+        after: tuple[datetime, int] | None = None,
     ) -> list[Lead]:
-        """Get all leads that are due for follow-up (must have first message sent)."""
+        """
+        Get leads that are due for follow-up (must have first message sent),
+        ordered by (due time, id).
+
+        Args:
+            limit: Page size (None = all due leads)
+            after: Keyset cursor - (followup_due_at, id) of the last lead of
+                the previous page
+        """
         now = datetime.utcnow()
         result = await session.execute(
-            select(Lead).where(
+            self._keyset_page(
+                select(Lead).where(*self._pending_followup_filters(now)),
+                Lead.followup_due_at,
+                limit,
+                after,
+            )
+        )
+        return list(result.scalars().all())
+
+    async def claim_leads_pending_followup(
+        self,
+        session: AsyncSession,
+        limit: int | None = None,
+        after: tuple[datetime, int] | None = None,
+    ) -> list[Lead]:
+        """Claim (lease) the next page of leads due for follow-up."""
+        return await self._claim(
+            session,
+            self._pending_followup_filters(datetime.utcnow()),
+            Lead.followup_due_at,
+            limit,
+            after,
+        )
+
+    @classmethod
+    def _pending_followup_filters(cls, now: datetime) -> list[Any]:
+        """Filters for leads due for their follow-up."""
+        return [
+            Lead.is_done == False,  # noqa: E712
+            Lead.first_message_sent == True,  # noqa: E712
+            Lead.followup_due_at.isnot(None),
+            Lead.followup_due_at <= now,
+            *cls._retry_ready(now),
+        ]
+
+    async def _claim(
+        self,
+        session: AsyncSession,
+        filters: list[Any],
+        due_column: Any,
+        limit: int | None,
+        after: tuple[datetime, int] | None,
+    ) -> list[Lead]:
+        """
+        Atomically lease the next page of matching leads to this worker.
+
+        The page is selected and leased in one UPDATE ... RETURNING, so
+        concurrent workers (processes or replicas) never get the same lead.
+        Leases held by a worker that died expire after scheduler_lease_seconds.
+        """
+        now = datetime.utcnow()
+        lease_free = or_(Lead.lease_until.is_(None), Lead.lease_until <= now)
+        page_ids = self._keyset_page(
+            select(Lead.id).where(*filters, lease_free), due_column, limit, after
+        ).with_for_update(skip_locked=True)
+
+        result = await session.execute(
+            update(Lead)
+            .where(Lead.id.in_(page_ids), lease_free)
+            .values(
+                claimed_by=self.worker_id,
+                lease_until=now + timedelta(seconds=settings.scheduler_lease_seconds),
+            )
+            .returning(Lead),
+            execution_options={"synchronize_session": False},
+        )
+        leads = list(result.scalars().all())
+        return sorted(leads, key=lambda lead: (getattr(lead, due_column.key), lead.id))
+
+    async def renew_lease(self, lead: Lead) -> bool:
+        """
+        Extend this worker's lease on a lead right before it is processed.
+
+        Long throttle / Monday budget waits can outlast the lease taken with
+        the page. Returns False if the lease has been taken over by another
+        worker, in which case the lead must not be processed.
+        """
+        async with get_session() as session:
+            result = await session.execute(
+                update(Lead)
+                .where(Lead.id == lead.id, Lead.claimed_by == self.worker_id)
+                .values(
+                    lease_until=datetime.utcnow()
+                    + timedelta(seconds=settings.scheduler_lease_seconds)
+                )
+                .returning(Lead.id),
+                execution_options={"synchronize_session": False},
+            )
+            return result.first() is not None
+
+    async def release_leads(self, session: AsyncSession, leads: list[Lead]) -> set[int]:
+        """
+        Release this worker's leases on processed leads, in the session's transaction.
+
+        Returns the IDs that were still leased to this worker; results for the
+        others must not be written back.
+        """
+        # Check ownership before the leads' own changes are flushed
+        with session.no_autoflush:
+            result = await session.execute(
+                update(Lead)
+                .where(
+                    Lead.id.in_([lead.id for lead in leads]),
+                    Lead.claimed_by == self.worker_id,
+                )
+                .values(claimed_by=None, lease_until=None)
+                .returning(Lead.id),
+                execution_options={"synchronize_session": False},
+            )
+        return set(result.scalars())
+
+    @staticmethod
+    def lead_state(lead: Lead) -> dict[str, Any]:
+        """Loaded column values of a lead, to save it again if its commit fails."""
+        loaded = inspect(lead).dict
+        return {
+            column.key: loaded[column.key]
+            for column in Lead.__mapper__.column_attrs
+            if column.key not in ("id", "claimed_by", "lease_until") and column.key in loaded
+        }
+
+    async def save_lead_states(
+        self,
+        states: dict[int, dict[str, Any]],
+        outbox_writes: list[tuple[str, str, str]] | None = None,
+    ) -> bool:
+        """
+        Write lead column values (see lead_state) in a fresh transaction.
+
+        outbox_writes are the Monday status writes (item, status, column)
+        staged with the leads; they are staged again in the same transaction
+        for every lead that is saved. Leads leased to another worker in the
+        meantime are left alone, and so are their writes.
+        """
+        try:
+            async with get_session() as session:
+                saved_items: set[str] = set()
+                for lead_id, values in states.items():
+                    result = await session.execute(
+                        update(Lead)
+                        .where(
+                            Lead.id == lead_id,
+                            or_(Lead.claimed_by.is_(None), Lead.claimed_by == self.worker_id),
+                        )
+                        .values(**values, claimed_by=None, lease_until=None)
+                        .returning(Lead.monday_item_id),
+                        execution_options={"synchronize_session": False},
+                    )
+                    saved_items.update(result.scalars())
+                for monday_item_id, status, column_id in outbox_writes or []:
+                    if monday_item_id in saved_items:
+                        monday_outbox.add(session, monday_item_id, status, column_id)
+        except Exception as e:
+            logger.error("lead_state_save_failed", lead_ids=list(states), error=str(e))
+            return False
+        return True
+
+    @staticmethod
+    def _keyset_page(
+        query: Select[Any],
+        due_column: Any,
+        limit: int | None,
+        after: tuple[datetime, int] | None,
+    ) -> Select[Any]:
+        """Order a pending-lead query by (due_column, id) and seek past the cursor."""
+        if after is not None:
+            after_due, after_id = after
+            query = query.where(
+                or_(
+                    due_column > after_due,
+                    and_(due_column == after_due, Lead.id > after_id),
+                )
+            )
+        query = query.order_by(due_column, Lead.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query
+
+    async def update_monday_status(
+        self,
+        session: AsyncSession,
+        monday_item_id: str,
+        status: str,
+        status_column_id: str | None = None,
+        error_event: str = "failed_to_update_monday_status",
+    ) -> None:
+        """
+        Update a lead's Monday status after a state change.
+
+        With the outbox enabled the write is staged in the session and sent by
+        the dispatcher after commit; otherwise Monday is called inline and a
+        failure is logged (the message was already sent, so we continue).
+        """
+        status_column_id = status_column_id or settings.monday_status_column_id
+
+        if settings.monday_outbox_enabled:
+            monday_outbox.add(session, monday_item_id, status, status_column_id)
+            return
+
+        try:
+            await monday_service.update_item_status(monday_item_id, status, status_column_id)
+        except MondayAPIError as e:
+            logger.error(error_event, monday_item_id=monday_item_id, error=str(e))
+
+    def record_failure(self, lead: Lead, error: Exception) -> None:
+        """
+        Record a failed send attempt for a lead.
+
+        Schedules the next attempt with exponential backoff and jitter (moved
+        into the send window), or dead-letters the lead after lead_max_attempts.
+        """
+        now = datetime.utcnow()
+        lead.attempt_count = (lead.attempt_count or 0) + 1
+        lead.last_error = str(error)[:1000]
+
+        if lead.attempt_count >= settings.lead_max_attempts:
+            lead.dead_lettered_at = now
+            lead.next_attempt_at = None
+            logger.error(
+                "lead_dead_lettered",
+                lead_id=lead.id,
+                attempts=lead.attempt_count,
+                error=lead.last_error,
+            )
+            return
+
+        backoff = min(
+            settings.lead_retry_max_seconds,
+            settings.lead_retry_base_seconds * 2 ** (lead.attempt_count - 1),
+        )
+        # "Equal jitter": half fixed, half random, so retries spread out
+        delay = backoff / 2 + random.uniform(0, backoff / 2)
+        lead.next_attempt_at = send_window_calendar.next_open(now + timedelta(seconds=delay))
+        due_queue.push(
+            lead.next_attempt_at,
+            DUE_FOLLOWUP if lead.first_message_sent else DUE_INITIAL_MESSAGE,
+        )
+
+        logger.warning(
+            "lead_retry_scheduled",
+            lead_id=lead.id,
+            attempts=lead.attempt_count,
+            next_attempt_at=lead.next_attempt_at,
+        )
+
+    @staticmethod
+    def _clear_retry_state(lead: Lead) -> None:
+        """Reset the retry state after a successful send."""
+        lead.attempt_count = 0
+        lead.next_attempt_at = None
+        lead.last_error = None
+
+    @staticmethod
+    def _retry_ready(now: datetime) -> list[Any]:
+        """Filters excluding dead-lettered leads and leads waiting for a retry."""
+        return [
+            Lead.dead_lettered_at.is_(None),
+            or_(Lead.next_attempt_at.is_(None), Lead.next_attempt_at <= now),
+        ]
+
+    async def get_backlog_counts(self, session: AsyncSession) -> dict[str, int]:
+        """
+        Count the pending-lead backlog for metrics.
+
+        Returns due initial messages, due follow-ups, how many pending leads
+        (due now or later) will be deferred because their send time falls
+        outside the send window, and dead-lettered leads.
+        """
+        now = datetime.utcnow()
+        initial_due = await session.scalar(
+            select(func.count(Lead.id)).where(*self._pending_initial_filters(now))
+        )
+        followup_due = await session.scalar(
+            select(func.count(Lead.id)).where(*self._pending_followup_filters(now))
+        )
+        dead_lettered = await session.scalar(
+            select(func.count(Lead.id)).where(Lead.dead_lettered_at.isnot(None))
+        )
+
+        # A lead is sent at its due time, or now if that has passed; the
+        # calendar works in whole local hours, so check each hour once
+        open_hours: dict[datetime, bool] = {}
+        out_of_window = 0
+        for due_at, _ in await self.get_pending_due_times(session):
+            hour = max(due_at, now).replace(minute=0, second=0, microsecond=0)
+            if hour not in open_hours:
+                open_hours[hour] = send_window_calendar.is_open(hour)
+            out_of_window += not open_hours[hour]
+
+        return {
+            "initial_due": initial_due or 0,
+            "followup_due": followup_due or 0,
+            "out_of_window": out_of_window,
+            "dead_lettered": dead_lettered or 0,
+        }
+
+    async def get_pending_due_times(
+        self, session: AsyncSession
+    ) -> list[tuple[datetime, str]]:
+        """Get the due times of all leads still waiting for a message."""
+        initial = await session.execute(
+            select(Lead.first_message_due_at, Lead.next_attempt_at).where(
+                Lead.first_message_sent == False,  # noqa: E712
+                Lead.first_message_due_at.isnot(None),
+                Lead.is_done == False,  # noqa: E712
+                Lead.dead_lettered_at.is_(None),
+            )
+        )
+        followup = await session.execute(
+            select(Lead.followup_due_at, Lead.next_attempt_at).where(
                 Lead.is_done == False,  # noqa: E712
                 Lead.first_message_sent == True,  # noqa: E712
                 Lead.followup_due_at.isnot(None),
-                Lead.followup_due_at <= now,
+                Lead.dead_lettered_at.is_(None),
             )
         )
-        return list(result.scalars().all())
+        # A lead waiting for a retry is due at its next attempt, not its original due time
+        return [
+            (max(due_at, next_attempt_at or due_at), DUE_INITIAL_MESSAGE)
+            for due_at, next_attempt_at in initial
+        ] + [
+            (max(due_at, next_attempt_at or due_at), DUE_FOLLOWUP)
+            for due_at, next_attempt_at in followup
+        ]
 
 
 lead_service = LeadService()
@@ -0,0 +1,64 @@
+"""Lease-based leader election backed by the leader_locks table."""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, delete, or_
+from sqlalchemy.dialects.sqlite import insert
+
+from src.core.logging import get_logger
+from src.db.models import LeaderLock
+from src.db.session import get_session
+
+logger = get_logger(__name__)
+
+
+class LeaderLease:
+    """
+    A named lock held by at most one process at a time.
+
+    acquire() takes the lock if it is free or expired, and renews it if this
+    holder already owns it, in one atomic upsert. The holder must keep
+    renewing before lease_seconds pass; if it dies, another process takes
+    over on its next attempt after the lease expires.
+    """
+
+    def __init__(self, name: str, holder: str, lease_seconds: float) -> None:
+        self.name = name
+        self.holder = holder
+        self.lease_seconds = lease_seconds
+
+    async def acquire(self) -> bool:
+        """Acquire or renew the lease. Returns True if this holder is the leader."""
+        now = datetime.utcnow()
+        lease_until = now + timedelta(seconds=self.lease_seconds)
+
+        stmt = insert(LeaderLock).values(
+            name=self.name, holder=self.holder, lease_until=lease_until, acquired_at=now
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["name"],
+            set_={
+                "holder": self.holder,
+                "lease_until": lease_until,
+                # Keep the original acquisition time across renewals
+                "acquired_at": case(
+                    (LeaderLock.holder == self.holder, LeaderLock.acquired_at),
+                    else_=stmt.excluded.acquired_at,
+                ),
+            },
+            where=or_(LeaderLock.holder == self.holder, LeaderLock.lease_until <= now),
+        ).returning(LeaderLock.holder)
+
+        async with get_session() as session:
+            result = await session.execute(stmt)
+            return result.scalar_one_or_none() == self.holder
+
+    async def release(self) -> None:
+        """Give up the lease (if held) so another process can take over at once."""
+        async with get_session() as session:
+            await session.execute(
+                delete(LeaderLock).where(
+                    LeaderLock.name == self.name, LeaderLock.holder == self.holder
+                )
+            )
+        logger.info("leader_lease_released", name=self.name, holder=self.holder)
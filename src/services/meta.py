@@ -1,29 +1,106 @@
 """Meta WhatsApp Business API client service."""
 
+import time
 from typing import Any
 
 import httpx
 
 from src.core.config import get_settings
 from src.core.exceptions import MetaAPIError
+from src.core.http import create_http_client
 from src.core.logging import get_logger
+from src.core.metrics import META_SEND_SECONDS, META_SENDS_TOTAL
+from src.services.meta_throttle import THROTTLE_ERROR_CODES, MetaSendThrottler
 
 logger = get_logger(__name__)
 settings = get_settings()
 
-META_API_BASE_URL = "https://graph.facebook.com/v18.0"
-
 
 class MetaService:
     """Service for interacting with Meta WhatsApp Business API."""
 
     def __init__(self) -> None:
         self.api_token = settings.meta_api_token
+        self.api_base_url = settings.meta_api_base_url
         self.phone_id = settings.meta_phone_id
         self.headers = {
             "Authorization": f"Bearer {self.api_token}",
             "Content-Type": "application/json",
         }
+        self._client: httpx.AsyncClient | None = None
+        self.throttler = MetaSendThrottler()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared HTTP client (created lazily if start() was not called)."""
+        if self._client is None or self._client.is_closed:
+            self._client = create_http_client(self.headers)
+        return self._client
+
+    async def start(self) -> None:
+        """Open the shared HTTP client."""
+        _ = self.client
+
+    async def close(self) -> None:
+        """Close the shared HTTP client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _post_message(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """
+        POST a message payload to the WhatsApp messages endpoint.
+
+        Sends are paced by the throttler; throttling errors are retried after
+        an adaptive backoff, up to meta_max_retries times.
+        """
+        recipient = payload["to"]
+
+        for attempt in range(settings.meta_max_retries + 1):
+            await self.throttler.acquire(recipient)
+            try:
+                data = await self._send(payload)
+            except MetaAPIError as e:
+                if e.error_code not in THROTTLE_ERROR_CODES or attempt == settings.meta_max_retries:
+                    raise
+                self.throttler.on_throttled(recipient, e.error_code)
+                continue
+
+            self.throttler.on_success()
+            return data
+
+        raise MetaAPIError("Meta API send retries exhausted")
+
+    async def _send(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Send a single request to the messages endpoint."""
+        url = f"{self.api_base_url}/{self.phone_id}/messages"
+        started = time.perf_counter()
+
+        try:
+            response = await self.client.post(url, json=payload)
+            response.raise_for_status()
+            data = response.json()
+        except httpx.HTTPStatusError as e:
+            error_data = e.response.json() if e.response.content else {}
+            logger.error(
+                "meta_api_error",
+                status_code=e.response.status_code,
+                error=error_data,
+            )
+            error_code = (error_data.get("error") or {}).get("code")
+            _observe_send(started, "api_error", str(error_code or e.response.status_code))
+            raise MetaAPIError(
+                f"Meta API error: {error_data}",
+                error_code=error_code,
+                status_code=e.response.status_code,
+            ) from e
+        except httpx.HTTPError as e:
+            logger.error("meta_http_error", error=str(e))
+            _observe_send(started, "http_error", type(e).__name__)
+            raise MetaAPIError(f"HTTP error communicating with Meta: {e}") from e
+
+        _observe_send(started, "ok", "")
+        return data
 
     async def send_text_message(self, to_phone: str, message: str) -> dict[str, Any]:
         """
@@ -36,8 +113,6 @@ class MetaService:
         Returns:
             The API response containing message ID
         """
-        url = f"{META_API_BASE_URL}/{self.phone_id}/messages"
-
         # Normalize phone number (remove + if present, Meta expects without it)
         normalized_phone = to_phone.lstrip("+")
 
@@ -49,34 +124,13 @@ class MetaService:
             "text": {"body": message},
         }
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    url,
-                    json=payload,
-                    headers=self.headers,
-                    timeout=30.0,
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                logger.info(
-                    "whatsapp_message_sent",
-                    to=normalized_phone,
-                    message_id=data.get("messages", [{}])[0].get("id"),
-                )
-                return data
-            except httpx.HTTPStatusError as e:
-                error_data = e.response.json() if e.response.content else {}
-                logger.error(
-                    "meta_api_error",
-                    status_code=e.response.status_code,
-                    error=error_data,
-                )
-                raise MetaAPIError(f"Meta API error: {error_data}") from e
-            except httpx.HTTPError as e:
-                logger.error("meta_http_error", error=str(e))
-                raise MetaAPIError(f"HTTP error communicating with Meta: {e}") from e
+        data = await self._post_message(payload)
+        logger.info(
+            "whatsapp_message_sent",
+            to_phone=normalized_phone,
+            message_id=data.get("messages", [{}])[0].get("id"),
+        )
+        return data
 
     async def send_template_message(
         self,
@@ -97,8 +151,6 @@ class MetaService:
         Returns:
             The API response containing message ID
         """
-        url = f"{META_API_BASE_URL}/{self.phone_id}/messages"
-
         normalized_phone = to_phone.lstrip("+")
 
         payload: dict[str, Any] = {
@@ -115,35 +167,20 @@ class MetaService:
         if components:
             payload["template"]["components"] = components
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    url,
-                    json=payload,
-                    headers=self.headers,
-                    timeout=30.0,
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                logger.info(
-                    "whatsapp_template_sent",
-                    to=normalized_phone,
-                    template=template_name,
-                    message_id=data.get("messages", [{}])[0].get("id"),
-                )
-                return data
-            except httpx.HTTPStatusError as e:
-                error_data = e.response.json() if e.response.content else {}
-                logger.error(
-                    "meta_api_error",
-                    status_code=e.response.status_code,
-                    error=error_data,
-                )
-                raise MetaAPIError(f"Meta API error: {error_data}") from e
-            except httpx.HTTPError as e:
-                logger.error("meta_http_error", error=str(e))
-                raise MetaAPIError(f"HTTP error communicating with Meta: {e}") from e
+        data = await self._post_message(payload)
+        logger.info(
+            "whatsapp_template_sent",
+            to_phone=normalized_phone,
+            template=template_name,
+            message_id=data.get("messages", [{}])[0].get("id"),
+        )
+        return data
+
+
+def _observe_send(started: float, outcome: str, error_code: str) -> None:
+    """Record a send request's latency and outcome."""
+    META_SEND_SECONDS.labels(outcome=outcome).observe(time.perf_counter() - started)
+    META_SENDS_TOTAL.labels(outcome=outcome, error_code=error_code).inc()
 
 
 meta_service = MetaService()
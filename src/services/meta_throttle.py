@@ -0,0 +1,99 @@
+"""Async send pacing for the WhatsApp Cloud API."""
+
+import asyncio
+import time
+
+from src.core.config import get_settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Meta error codes that mean "slow down"
+THROUGHPUT_ERROR_CODES = {
+    4,  # Application request limit reached
+    80007,  # WhatsApp Business Account rate limit
+    130429,  # Cloud API throughput limit
+    131048,  # Spam rate limit
+}
+PAIR_RATE_ERROR_CODE = 131056  # Too many messages to the same recipient
+THROTTLE_ERROR_CODES = THROUGHPUT_ERROR_CODES | {PAIR_RATE_ERROR_CODE}
+
+# Max pause after repeated throttling errors
+MAX_BACKOFF_SECONDS = 60.0
+# Recipient entries kept before stale ones are pruned
+MAX_TRACKED_RECIPIENTS = 10000
+
+
+class MetaSendThrottler:
+    """
+    Pace outgoing messages with a global rate cap and per-recipient spacing.
+
+    Callers reserve a send slot under a lock and sleep outside it, so a burst
+    goes out at the current rate without serialising on network latency.
+    Throughput errors halve the rate and pause sends with exponential
+    backoff; pair-rate errors push back only the affected recipient. Each
+    success recovers the rate additively toward the configured maximum.
+    """
+
+    def __init__(self) -> None:
+        self.max_rate = settings.meta_messages_per_second
+        self.rate = self.max_rate
+        self.paused_until = 0.0
+        self._next_slot = 0.0
+        self._recipient_next: dict[str, float] = {}
+        self._consecutive_throttles = 0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, recipient: str) -> None:
+        """Wait until a message to recipient may be sent."""
+        async with self._lock:
+            now = time.monotonic()
+            global_slot = max(now, self._next_slot, self.paused_until)
+            send_at = max(global_slot, self._recipient_next.get(recipient, 0.0))
+
+            self._next_slot = global_slot + 1.0 / self.rate
+            self._recipient_next[recipient] = (
+                send_at + settings.meta_per_recipient_spacing_seconds
+            )
+            if len(self._recipient_next) > MAX_TRACKED_RECIPIENTS:
+                self._recipient_next = {
+                    phone: until
+                    for phone, until in self._recipient_next.items()
+                    if until > now
+                }
+
+        wait = send_at - now
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self) -> None:
+        """Recover the send rate after a successful send."""
+        self._consecutive_throttles = 0
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+    def on_throttled(self, recipient: str, error_code: int | None) -> float:
+        """Back off after a throttling error. Returns the backoff in seconds."""
+        self._consecutive_throttles += 1
+        backoff = min(
+            MAX_BACKOFF_SECONDS,
+            settings.meta_throttle_backoff_seconds * 2 ** (self._consecutive_throttles - 1),
+        )
+        now = time.monotonic()
+
+        if error_code == PAIR_RATE_ERROR_CODE:
+            self._recipient_next[recipient] = max(
+                self._recipient_next.get(recipient, 0.0), now + backoff
+            )
+        else:
+            self.rate = max(settings.meta_min_messages_per_second, self.rate / 2)
+            self.paused_until = max(self.paused_until, now + backoff)
+
+        logger.warning(
+            "meta_send_throttled",
+            error_code=error_code,
+            backoff_seconds=backoff,
+            rate_per_second=round(self.rate, 2),
+        )
+        return backoff
@@ -1,17 +1,40 @@
 """Monday.com API client service."""
 
+import asyncio
+import json
+import re
+import time
 from typing import Any
 
 import httpx
 
 from src.core.config import get_settings
 from src.core.exceptions import MondayAPIError
+from src.core.http import create_http_client
 from src.core.logging import get_logger
+from src.core.metrics import MONDAY_REQUEST_SECONDS
+from src.schemas.monday import MondayLead
+from src.services.monday_budget import MondayComplexityBudget
 
 logger = get_logger(__name__)
 settings = get_settings()
 
-MONDAY_API_URL = "https://api.monday.com/v2"
+
+# Monday accepts at most 100 item IDs per items(ids: [...]) query
+MONDAY_MAX_ITEMS_PER_QUERY = 100
+
+# Requested on every call to keep the client-side budget in sync
+COMPLEXITY_FIELD = "complexity { before after reset_in_x_seconds }"
+
+# GraphQL error codes meaning "budget/rate limit hit, retry later"
+RATE_LIMIT_ERROR_CODES = {
+    "ComplexityException",
+    "COMPLEXITY_BUDGET_EXHAUSTED",
+    "RATE_LIMIT_EXCEEDED",
+    "maxConcurrencyExceeded",
+}
+
+_OPERATION_NAME = re.compile(r"^\s*(?:query|mutation)\s+(\w+)")
 
 # Status strings (Hebrew) - DO NOT TRANSLATE
 STATUS_NEW_LEAD = "לייד חדש"
@@ -22,47 +45,174 @@ STATUS_CUSTOMER_REPLIED = "לקוח הגיב"
 STATUS_MEETING_SET = "נקבעה שיחת מכירה"
 
 
+class MondayStatusBatcher:
+    """
+    Coalesce status updates issued within a short window into batched requests.
+
+    Each caller awaits its own result (or MondayAPIError). Batches are split
+    into chunks so a single request stays under the configured complexity.
+    """
+
+    def __init__(self, service: "MondayService") -> None:
+        self.service = service
+        self._pending: list[tuple[str, str, str, asyncio.Future[dict[str, Any]]]] = []
+        self._flush_task: asyncio.Task[None] | None = None
+
+    @property
+    def chunk_size(self) -> int:
+        """Max mutations per request given the complexity settings."""
+        return max(
+            1,
+            settings.monday_max_complexity_per_request
+            // max(1, settings.monday_status_mutation_complexity),
+        )
+
+    async def submit(self, item_id: str, status: str, status_column_id: str) -> dict[str, Any]:
+        """Queue a status update and wait for the batch it is sent in."""
+        future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        self._pending.append((item_id, status, status_column_id, future))
+
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+
+        return await future
+
+    async def _flush_after_window(self) -> None:
+        """Wait for the coalescing window, then send everything buffered."""
+        await asyncio.sleep(settings.monday_status_batch_window_ms / 1000)
+        pending, self._pending = self._pending, []
+        self._flush_task = None
+
+        chunk_size = self.chunk_size
+        chunks = [pending[i : i + chunk_size] for i in range(0, len(pending), chunk_size)]
+        await asyncio.gather(*(self._send_chunk(chunk) for chunk in chunks))
+
+    async def _send_chunk(
+        self, chunk: list[tuple[str, str, str, asyncio.Future[dict[str, Any]]]]
+    ) -> None:
+        """Send one chunk and resolve each caller's future."""
+        try:
+            results = await self.service.update_items_status(
+                [(item_id, status, column_id) for item_id, status, column_id, _ in chunk]
+            )
+        except Exception as e:
+            for *_, future in chunk:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (*_, future), result in zip(chunk, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
 class MondayService:
     """Service for interacting with Monday.com API."""
 
     def __init__(self) -> None:
         self.api_key = settings.monday_api_key
+        self.api_url = settings.monday_api_url
         self.board_id = settings.monday_board_id
         self.headers = {
             "Authorization": self.api_key,
             "Content-Type": "application/json",
         }
+        self._client: httpx.AsyncClient | None = None
+        self.status_batcher = MondayStatusBatcher(self)
+        self.budget = MondayComplexityBudget()
 
-    async def _execute_query(self, query: str, variables: dict[str, Any] | None = None) -> dict[str, Any]:
-        """Execute a GraphQL query against Monday.com API."""
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared HTTP client (created lazily if start() was not called)."""
+        if self._client is None or self._client.is_closed:
+            self._client = create_http_client(self.headers)
+        return self._client
+
+    async def start(self) -> None:
+        """Open the shared HTTP client."""
+        _ = self.client
+
+    async def close(self) -> None:
+        """Close the shared HTTP client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _post_graphql(
+        self, query: str, variables: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """
+        POST a GraphQL request and return the raw response body (may contain errors).
+
+        Waits for complexity budget before sending, and retries with the
+        server-provided delay on 429 or budget-exhausted errors.
+        """
         payload: dict[str, Any] = {"query": query}
         if variables:
             payload["variables"] = variables
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    MONDAY_API_URL,
-                    json=payload,
-                    headers=self.headers,
-                    timeout=30.0,
-                )
-                response.raise_for_status()
-                data = response.json()
+        match = _OPERATION_NAME.match(query)
+        operation = match.group(1) if match else "anonymous"
+        started = time.perf_counter()
 
-                if "errors" in data:
-                    logger.error("monday_api_error", errors=data["errors"])
-                    raise MondayAPIError(f"Monday API error: {data['errors']}")
+        for attempt in range(settings.monday_max_retries + 1):
+            await self.budget.acquire(operation)
 
-                return data
+            try:
+                response = await self.client.post(self.api_url, json=payload)
+                retry_after = _retry_after(response)
+                if retry_after is None:
+                    response.raise_for_status()
+                    data = response.json()
+                    retry_after = _rate_limit_retry_in(data)
             except httpx.HTTPError as e:
                 logger.error("monday_http_error", error=str(e))
+                MONDAY_REQUEST_SECONDS.labels(operation=operation, outcome="http_error").observe(
+                    time.perf_counter() - started
+                )
                 raise MondayAPIError(f"HTTP error communicating with Monday: {e}") from e
 
+            if retry_after is None:
+                self.budget.record(operation, (data.get("data") or {}).get("complexity"))
+                MONDAY_REQUEST_SECONDS.labels(
+                    operation=operation, outcome="error" if "errors" in data else "ok"
+                ).observe(time.perf_counter() - started)
+                return data
+
+            self.budget.pause(retry_after)
+            if attempt == settings.monday_max_retries:
+                break
+            logger.warning(
+                "monday_request_retry",
+                operation=operation,
+                attempt=attempt + 1,
+                retry_after_seconds=retry_after,
+            )
+
+        MONDAY_REQUEST_SECONDS.labels(operation=operation, outcome="rate_limited").observe(
+            time.perf_counter() - started
+        )
+        raise MondayAPIError(f"Monday API rate limit exceeded for {operation}")
+
+    async def _execute_query(self, query: str, variables: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Execute a GraphQL query against Monday.com API."""
+        data = await self._post_graphql(query, variables)
+
+        if "errors" in data:
+            logger.error("monday_api_error", errors=data["errors"])
+            raise MondayAPIError(f"Monday API error: {data['errors']}")
+
+        return data
+
     async def get_item(self, item_id: str) -> dict[str, Any]:
         """Fetch an item by ID from Monday.com."""
         query = """
         query GetItem($itemId: [ID!]) {
+            complexity { before after reset_in_x_seconds }
             items(ids: $itemId) {
                 id
                 name
@@ -83,20 +233,112 @@ class MondayService:
 
         return items[0]
 
+    async def get_item_columns(
+        self, item_id: str, column_ids: list[str]
+    ) -> dict[str, Any]:
+        """Fetch an item with only the requested column values."""
+        query = """
+        query GetItemColumns($itemId: [ID!], $columnIds: [String!]) {
+            complexity { before after reset_in_x_seconds }
+            items(ids: $itemId) {
+                id
+                name
+                column_values(ids: $columnIds) {
+                    id
+                    text
+                    value
+                }
+            }
+        }
+        """
+        variables = {"itemId": [item_id], "columnIds": column_ids}
+        result = await self._execute_query(query, variables)
+
+        items = result.get("data", {}).get("items", [])
+        if not items:
+            raise MondayAPIError(f"Item {item_id} not found")
+
+        return items[0]
+
+    async def get_lead(
+        self,
+        item_id: str,
+        phone_column_id: str = "phone",
+        status_column_id: str = "status",
+    ) -> MondayLead:
+        """Fetch name, phone and status of a lead item in a single API call."""
+        item = await self.get_item_columns(item_id, [phone_column_id, status_column_id])
+        columns = {col["id"]: col for col in item.get("column_values", [])}
+
+        return MondayLead(
+            item_id=str(item.get("id", item_id)),
+            name=item.get("name") or "",
+            phone=_parse_phone_column(columns.get(phone_column_id)),
+            status=(columns.get(status_column_id) or {}).get("text") or "",
+        )
+
     async def get_item_status(self, item_id: str, status_column_id: str = "status") -> str:
         """Get the current status of an item."""
-        item = await self.get_item(item_id)
+        item = await self.get_item_columns(item_id, [status_column_id])
         for col in item.get("column_values", []):
             if col["id"] == status_column_id:
-                return col.get("text", "")
+                return col.get("text") or ""
         return ""
 
+    async def get_items_status(
+        self, item_ids: list[str], status_column_id: str = "status"
+    ) -> dict[str, str]:
+        """
+        Get the current status of many items with chunked multi-item queries.
+
+        Returns a mapping of item ID to status text. Items that Monday did not
+        return (e.g. deleted) are absent from the mapping.
+        """
+        query = """
+        query GetItemsStatus($itemIds: [ID!], $columnIds: [String!], $limit: Int) {
+            complexity { before after reset_in_x_seconds }
+            items(ids: $itemIds, limit: $limit) {
+                id
+                column_values(ids: $columnIds) {
+                    id
+                    text
+                }
+            }
+        }
+        """
+        statuses: dict[str, str] = {}
+        unique_ids = list(dict.fromkeys(item_ids))
+
+        for start in range(0, len(unique_ids), MONDAY_MAX_ITEMS_PER_QUERY):
+            chunk = unique_ids[start : start + MONDAY_MAX_ITEMS_PER_QUERY]
+            variables = {
+                "itemIds": chunk,
+                "columnIds": [status_column_id],
+                "limit": len(chunk),
+            }
+            result = await self._execute_query(query, variables)
+
+            for item in result.get("data", {}).get("items", []):
+                status = ""
+                for col in item.get("column_values", []):
+                    if col["id"] == status_column_id:
+                        status = col.get("text") or ""
+                statuses[str(item["id"])] = status
+
+        logger.info(
+            "monday_items_status_fetched",
+            requested=len(unique_ids),
+            found=len(statuses),
+        )
+        return statuses
+
     async def update_item_status(
         self, item_id: str, status: str, status_column_id: str = "status"
     ) -> dict[str, Any]:
         """Update the status of an item on Monday.com."""
         query = """
         mutation UpdateItemStatus($boardId: ID!, $itemId: ID!, $columnId: String!, $value: JSON!) {
+            complexity { before after reset_in_x_seconds }
             change_column_value(
                 board_id: $boardId,
                 item_id: $itemId,
@@ -108,7 +350,6 @@ class MondayService:
         }
         """
         # Monday expects status as JSON with "label" key
-        import json
         value = json.dumps({"label": status})
 
         variables = {
@@ -119,24 +360,83 @@ class MondayService:
         }
 
         logger.info("updating_monday_status", item_id=item_id, new_status=status)
+        if settings.monday_coalesce_status_updates:
+            return await self.status_batcher.submit(item_id, status, status_column_id)
         return await self._execute_query(query, variables)
 
+    async def update_items_status(
+        self, updates: list[tuple[str, str, str]]
+    ) -> list[dict[str, Any] | MondayAPIError]:
+        """
+        Update many item statuses in one request using aliased mutations.
+
+        Args:
+            updates: (item_id, status, status_column_id) tuples
+
+        Returns:
+            One entry per update, in order: the change_column_value response
+            shaped like update_item_status's, or the MondayAPIError for that item.
+        """
+        if not updates:
+            return []
+
+        declarations = ["$boardId: ID!"]
+        fields = []
+        variables: dict[str, Any] = {"boardId": self.board_id}
+        for i, (item_id, status, column_id) in enumerate(updates):
+            declarations.append(f"$itemId{i}: ID!, $columnId{i}: String!, $value{i}: JSON!")
+            fields.append(
+                f"u{i}: change_column_value(board_id: $boardId, item_id: $itemId{i}, "
+                f"column_id: $columnId{i}, value: $value{i}) {{ id }}"
+            )
+            variables[f"itemId{i}"] = item_id
+            variables[f"columnId{i}"] = column_id
+            variables[f"value{i}"] = json.dumps({"label": status})
+
+        query = (
+            f"mutation UpdateItemsStatus({', '.join(declarations)}) {{\n"
+            + "\n".join([COMPLEXITY_FIELD, *fields])
+            + "\n}"
+        )
+        result = await self._post_graphql(query, variables)
+
+        data = result.get("data") or {}
+        errors_by_alias: dict[str, list[Any]] = {}
+        unattributed_errors: list[Any] = []
+        for error in result.get("errors", []):
+            path = error.get("path") or []
+            if path and isinstance(path[0], str):
+                errors_by_alias.setdefault(path[0], []).append(error)
+            else:
+                unattributed_errors.append(error)
+
+        if unattributed_errors:
+            logger.error("monday_api_error", errors=unattributed_errors)
+
+        results: list[dict[str, Any] | MondayAPIError] = []
+        for i, (item_id, _, _) in enumerate(updates):
+            alias = f"u{i}"
+            if data.get(alias) is not None:
+                results.append({"data": {"change_column_value": data[alias]}})
+            else:
+                errors = errors_by_alias.get(alias) or unattributed_errors or ["no result"]
+                results.append(MondayAPIError(f"Monday API error for item {item_id}: {errors}"))
+
+        logger.info(
+            "monday_status_batch_sent",
+            size=len(updates),
+            failed=sum(isinstance(r, MondayAPIError) for r in results),
+        )
+        return results
+
     async def get_phone_number_from_item(
         self, item_id: str, phone_column_id: str = "phone"
     ) -> str | None:
         """Extract phone number from an item."""
-        item = await self.get_item(item_id)
+        item = await self.get_item_columns(item_id, [phone_column_id])
         for col in item.get("column_values", []):
             if col["id"] == phone_column_id:
-                # Phone column value is JSON with "phone" key
-                value = col.get("value")
-                if value:
-                    import json
-                    try:
-                        parsed = json.loads(value)
-                        return parsed.get("phone")
-                    except (json.JSONDecodeError, TypeError):
-                        return col.get("text")
+                return _parse_phone_column(col)
         return None
 
     async def get_lead_name_from_item(self, item_id: str) -> str:
@@ -145,4 +445,44 @@ class MondayService:
         return item.get("name", "")
 
 
+def _retry_after(response: httpx.Response) -> float | None:
+    """Get the retry delay for a 429 response, or None if not rate limited."""
+    if response.status_code != 429:
+        return None
+    try:
+        return float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        return settings.monday_default_retry_after_seconds
+
+
+def _rate_limit_retry_in(data: dict[str, Any]) -> float | None:
+    """Get the retry delay from budget/rate-limit GraphQL errors, if any."""
+    errors = data.get("errors") or []
+    if data.get("error_code") in RATE_LIMIT_ERROR_CODES:
+        errors = [data]
+
+    for error in errors:
+        extensions = error.get("extensions") or {}
+        code = extensions.get("code") or error.get("error_code")
+        if code in RATE_LIMIT_ERROR_CODES:
+            retry_in = extensions.get("retry_in_seconds") or error.get("retry_in_seconds")
+            return float(retry_in) if retry_in else settings.monday_default_retry_after_seconds
+    return None
+
+
+def _parse_phone_column(col: dict[str, Any] | None) -> str | None:
+    """Extract the phone number from a phone column value."""
+    if not col:
+        return None
+    # Phone column value is JSON with "phone" key
+    value = col.get("value")
+    if value:
+        try:
+            parsed = json.loads(value)
+            return parsed.get("phone")
+        except (json.JSONDecodeError, TypeError, AttributeError):
+            return col.get("text")
+    return None
+
+
 monday_service = MondayService()
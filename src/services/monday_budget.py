@@ -0,0 +1,93 @@
+"""Client-side tracking of the Monday.com API complexity budget."""
+
+import asyncio
+import time
+from typing import Any
+
+from src.core.config import get_settings
+from src.core.logging import get_logger
+from src.core.metrics import MONDAY_COMPLEXITY_REMAINING
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Monday's complexity budget resets every minute
+BUDGET_WINDOW_SECONDS = 60.0
+
+
+class MondayComplexityBudget:
+    """
+    Token bucket over Monday's per-minute complexity budget.
+
+    Each call reserves its estimated cost (the last observed cost of the same
+    operation) before it is sent, and waits for the window reset if the
+    budget would be exceeded. Responses that include the `complexity` field
+    resync the bucket with Monday's own numbers, and 429 / budget-exhausted
+    responses pause all calls for the server-provided retry time.
+    """
+
+    def __init__(self) -> None:
+        self.capacity = settings.monday_complexity_budget_per_minute
+        self.remaining = float(self.capacity)
+        self.reset_at = time.monotonic() + BUDGET_WINDOW_SECONDS
+        self.paused_until = 0.0
+        self._costs: dict[str, int] = {}
+        self._lock = asyncio.Lock()
+
+    def estimate(self, operation: str) -> int:
+        """Estimated complexity of an operation (last observed, or the default)."""
+        return self._costs.get(operation, settings.monday_default_query_complexity)
+
+    def _refill(self, now: float) -> None:
+        """Refill the bucket if the budget window has reset."""
+        if now >= self.reset_at:
+            self.remaining = float(self.capacity)
+            self.reset_at = now + BUDGET_WINDOW_SECONDS
+
+    async def acquire(self, operation: str) -> None:
+        """Reserve budget for an operation, waiting until it is available."""
+        cost = self.estimate(operation)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.remaining >= cost or self.remaining >= self.capacity:
+                    self.remaining -= cost
+                    return
+                else:
+                    wait = self.reset_at - now
+
+                logger.warning(
+                    "monday_budget_wait",
+                    operation=operation,
+                    cost=cost,
+                    remaining=int(self.remaining),
+                    wait_seconds=round(wait, 2),
+                )
+                await asyncio.sleep(wait)
+
+    def record(self, operation: str, complexity: dict[str, Any] | None) -> None:
+        """Resync with the `complexity { before after reset_in_x_seconds }` response."""
+        if not complexity:
+            return
+
+        before = complexity.get("before")
+        after = complexity.get("after")
+        if before is not None and after is not None:
+            self._costs[operation] = max(0, int(before) - int(after))
+            self.remaining = float(after)
+            self.capacity = max(self.capacity, int(before))
+            MONDAY_COMPLEXITY_REMAINING.set(int(after))
+
+        reset_in = complexity.get("reset_in_x_seconds")
+        if reset_in is not None:
+            self.reset_at = time.monotonic() + float(reset_in)
+
+    def pause(self, seconds: float) -> None:
+        """Hold all calls for the given time (e.g. after a 429 Retry-After)."""
+        now = time.monotonic()
+        self.paused_until = max(self.paused_until, now + seconds)
+        logger.warning("monday_rate_limited", retry_after_seconds=seconds)
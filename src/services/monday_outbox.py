@@ -0,0 +1,237 @@
+"""Transactional outbox for Monday.com status writes."""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import and_, delete, event, exists, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from src.core.config import get_settings
+from src.core.logging import get_logger
+from src.db.models import MondayStatusOutbox
+from src.db.session import get_session
+from src.services.monday import monday_service
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# session.info key holding the rows add() staged in a session
+_STAGED_KEY = "monday_outbox_staged"
+
+
+class MondayStatusOutboxDispatcher:
+    """
+    Persist Monday status writes with the lead change and deliver them in the background.
+
+    add() stages an outbox row in the caller's session, so the write commits
+    (or rolls back) together with the lead state. The dispatcher claims due
+    rows atomically (UPDATE ... RETURNING), sends them as one aliased
+    mutation, deletes delivered rows and reschedules failures with
+    exponential backoff. Rows are parked as "failed" once attempts run out.
+
+    Writes for the same item and column are delivered strictly in order:
+    only the newest row per (item, column) is ever sent (older rows are
+    superseded and deleted), and never while another row for that item and
+    column is in flight, so a retried old status cannot overwrite a newer
+    one. Rows left "processing" longer than monday_outbox_lease_seconds
+    (crashed dispatcher) are claimed again.
+    """
+
+    def __init__(self) -> None:
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    def _wake(self, *_: Any) -> None:
+        """Wake the dispatcher (session after_commit hook)."""
+        self._wakeup.set()
+
+    def add(
+        self,
+        session: AsyncSession,
+        monday_item_id: str,
+        status: str,
+        column_id: str,
+    ) -> None:
+        """Stage a status write in the session; it is dispatched once the session commits."""
+        row = MondayStatusOutbox(
+            monday_item_id=monday_item_id,
+            status=status,
+            column_id=column_id,
+            state="pending",
+            attempts=0,
+            next_attempt_at=datetime.utcnow(),
+        )
+        session.add(row)
+        session.info.setdefault(_STAGED_KEY, []).append(row)
+        if not event.contains(session.sync_session, "after_commit", self._wake):
+            event.listen(session.sync_session, "after_commit", self._wake)
+
+    @staticmethod
+    def take_staged(session: AsyncSession) -> list[tuple[str, str, str]]:
+        """
+        Pop the (item, status, column) writes staged in the session since the last call.
+
+        Taken before a commit, so the writes can be staged again in a fresh
+        transaction if the commit fails and rolls them back.
+        """
+        rows: list[MondayStatusOutbox] = session.info.pop(_STAGED_KEY, [])
+        return [(row.monday_item_id, row.status, row.column_id) for row in rows]
+
+    async def start(self) -> None:
+        """Start the dispatcher."""
+        self._task = asyncio.create_task(self._run())
+        logger.info("monday_outbox_started")
+
+    async def stop(self) -> None:
+        """Stop the dispatcher (undelivered rows are sent on next start)."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        logger.info("monday_outbox_stopped")
+
+    @property
+    def batch_size(self) -> int:
+        """Rows per dispatch, capped by the Monday per-request complexity limit."""
+        return max(
+            1,
+            min(settings.monday_outbox_batch_size, monday_service.status_batcher.chunk_size),
+        )
+
+    async def _claim_batch(self) -> list[MondayStatusOutbox]:
+        """
+        Atomically claim the oldest due rows, at most one per item and column.
+
+        Superseded rows (a newer write exists for the same item and column)
+        are deleted first; rows whose item and column have a write in flight
+        wait for it to finish.
+        """
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=settings.monday_outbox_lease_seconds)
+        outbox = MondayStatusOutbox
+        other = aliased(MondayStatusOutbox)
+        same_key = and_(
+            other.monday_item_id == outbox.monday_item_id,
+            other.column_id == outbox.column_id,
+        )
+        # Claims without a time predate the claimed_at column
+        stale = or_(outbox.claimed_at.is_(None), outbox.claimed_at < stale_before)
+        superseded = exists().where(same_key, other.id > outbox.id)
+        in_flight = exists().where(
+            same_key,
+            other.id != outbox.id,
+            other.state == "processing",
+            other.claimed_at >= stale_before,
+        )
+        claimable = and_(
+            or_(
+                and_(outbox.state == "pending", outbox.next_attempt_at <= now),
+                and_(outbox.state == "processing", stale),
+            ),
+            ~superseded,
+            ~in_flight,
+        )
+
+        async with get_session() as session:
+            await session.execute(
+                delete(outbox).where(or_(outbox.state != "processing", stale), superseded)
+            )
+            due_ids = select(outbox.id).where(claimable).order_by(outbox.id).limit(self.batch_size)
+            result = await session.execute(
+                update(outbox)
+                .where(outbox.id.in_(due_ids), claimable)
+                .values(state="processing", attempts=outbox.attempts + 1, claimed_at=now)
+                .returning(outbox)
+            )
+            rows = list(result.scalars().all())
+
+        return sorted(rows, key=lambda row: row.id)
+
+    async def dispatch_once(self) -> int:
+        """Send one batch of due status writes. Returns the number of rows claimed."""
+        rows = await self._claim_batch()
+        if not rows:
+            return 0
+
+        try:
+            results: list[Any] = await monday_service.update_items_status(
+                [(row.monday_item_id, row.status, row.column_id) for row in rows]
+            )
+        except Exception as e:
+            results = [e] * len(rows)
+
+        delivered = [
+            row.id for row, result in zip(rows, results) if not isinstance(result, BaseException)
+        ]
+        failed = [
+            (row, result) for row, result in zip(rows, results) if isinstance(result, BaseException)
+        ]
+
+        async with get_session() as session:
+            if delivered:
+                await session.execute(
+                    delete(MondayStatusOutbox).where(MondayStatusOutbox.id.in_(delivered))
+                )
+            for row, error in failed:
+                await session.execute(self._failure_update(row, error))
+
+        logger.info(
+            "monday_outbox_dispatched",
+            claimed=len(rows),
+            delivered=len(delivered),
+            failed=len(failed),
+        )
+        return len(rows)
+
+    @staticmethod
+    def _failure_update(row: MondayStatusOutbox, error: BaseException) -> Any:
+        """Reschedule a failed row with exponential backoff, or park it."""
+        exhausted = row.attempts >= settings.monday_outbox_max_attempts
+        logger.error(
+            "monday_outbox_write_failed",
+            outbox_id=row.id,
+            monday_item_id=row.monday_item_id,
+            attempts=row.attempts,
+            exhausted=exhausted,
+            error=str(error),
+        )
+
+        delay = min(
+            settings.monday_outbox_retry_max_seconds,
+            settings.monday_outbox_retry_base_seconds * 2 ** (row.attempts - 1),
+        )
+        return (
+            update(MondayStatusOutbox)
+            .where(MondayStatusOutbox.id == row.id)
+            .values(
+                state="failed" if exhausted else "pending",
+                next_attempt_at=datetime.utcnow() + timedelta(seconds=delay),
+                claimed_at=None,
+                last_error=str(error)[:1000],
+            )
+        )
+
+    async def _run(self) -> None:
+        """Dispatcher loop: drain due rows, then wait for a commit or the poll interval."""
+        while True:
+            try:
+                self._wakeup.clear()
+                if await self.dispatch_once():
+                    continue
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), settings.monday_outbox_poll_seconds
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("monday_outbox_dispatcher_error", error=str(e))
+                await asyncio.sleep(settings.monday_outbox_poll_seconds)
+
+
+monday_outbox = MondayStatusOutboxDispatcher()
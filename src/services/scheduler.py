@@ -1,21 +1,38 @@
 """APScheduler service for background job processing."""
 
-from datetime import datetime
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from typing import Any
 
-import pytz
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.config import get_settings
+from src.core.exceptions import MondayAPIError
 from src.core.logging import get_logger
-from src.db.session import get_session
+from src.core.metrics import (
+    SCHEDULER_BATCH_SIZE,
+    SCHEDULER_JOB_SECONDS,
+    SCHEDULER_LEADS_TOTAL,
+)
+from src.db.models import Lead
+from src.db.session import async_session_factory, get_read_session, get_session
+from src.services.due_queue import DUE_FOLLOWUP, DUE_INITIAL_MESSAGE, due_queue
 from src.services.lead import lead_service
+from src.services.leader_lock import LeaderLease
+from src.services.monday import monday_service
+from src.services.monday_outbox import monday_outbox
+from src.services.send_window import ISRAEL_TZ, send_window_calendar
 
 logger = get_logger(__name__)
 settings = get_settings()
 
-# Israel timezone for time window checks
-ISRAEL_TZ = pytz.timezone("Asia/Jerusalem")
+# Leader lock name for the single active scheduler
+SCHEDULER_LEADER_LOCK = "scheduler"
 
 
 class SchedulerService:
@@ -24,14 +41,18 @@ class SchedulerService:
     def __init__(self) -> None:
         self.scheduler = AsyncIOScheduler()
         self._is_running = False
+        self._jobs_running = False
+        self._due_task: asyncio.Task[None] | None = None
+        self._leader_task: asyncio.Task[None] | None = None
+        self.leader = LeaderLease(
+            SCHEDULER_LEADER_LOCK,
+            lead_service.worker_id,
+            settings.scheduler_leader_lease_seconds,
+        )
 
     def is_within_send_window(self) -> bool:
-        """
-        Check if current time is within allowed send window (08:00 - 21:00 Israel Time).
-        """
-        now_israel = datetime.now(ISRAEL_TZ)
-        current_hour = now_israel.hour
-        return settings.send_window_start_hour <= current_hour < settings.send_window_end_hour
+        """Check if current time is within the allowed send window (Israel Time)."""
+        return send_window_calendar.is_open()
 
     async def process_pending_initial_messages(self) -> None:
         """
@@ -39,8 +60,10 @@ class SchedulerService:
 
         This job runs frequently (every 1-2 minutes) and:
         1. Checks if within send window
-        2. Fetches leads with first_message_due_at <= now and first_message_sent = False
-        3. Sends the initial welcome message for each lead
+        2. Fetches leads with first_message_due_at <= now and first_message_sent = False,
+           one keyset page at a time
+        3. Sends the initial welcome message for each lead, committing progress
+           per scheduler_commit_strategy
         """
         logger.info("initial_message_job_started")
 
@@ -52,24 +75,27 @@ class SchedulerService:
             )
             return
 
-        async with get_session() as session:
-            try:
-                leads = await lead_service.get_leads_pending_initial_message(session)
-                logger.info("pending_initial_messages_found", count=len(leads))
-
-                for lead in leads:
-                    try:
-                        await lead_service.send_initial_message(session, lead)
-                    except Exception as e:
-                        logger.error(
-                            "initial_message_error",
-                            lead_id=lead.id,
-                            error=str(e),
-                        )
-                        # Continue processing other leads
+        async def run_page(session: AsyncSession, leads: list[Lead]) -> None:
+            logger.info("pending_initial_messages_found", count=len(leads))
+            await self._run_batch(
+                "initial_messages",
+                session,
+                leads,
+                lead_service.send_initial_message,
+                error_event="initial_message_error",
+            )
 
-            except Exception as e:
-                logger.error("initial_message_job_error", error=str(e))
+        try:
+            with SCHEDULER_JOB_SECONDS.labels(job="initial_messages").time():
+                await self._run_paged(
+                    lead_service.claim_leads_pending_initial_message
+                    if settings.scheduler_claim_leads
+                    else lead_service.get_leads_pending_initial_message,
+                    lambda lead: lead.first_message_due_at,
+                    run_page,
+                )
+        except Exception as e:
+            logger.error("initial_message_job_error", error=str(e))
 
         logger.info("initial_message_job_completed")
 
@@ -79,8 +105,10 @@ class SchedulerService:
 
         This job runs frequently and:
         1. Checks if within send window
-        2. Fetches leads with followup_due_at < now and is_done = False
-        3. For each lead, runs Safety Check and sends follow-up if appropriate
+        2. Fetches leads with followup_due_at < now and is_done = False,
+           one keyset page at a time
+        3. Runs the Safety Check for the whole page with bulk Monday queries
+        4. Sends follow-up for each lead if appropriate
         """
         logger.info("followup_job_started")
 
@@ -92,33 +120,388 @@ class SchedulerService:
             )
             return
 
-        async with get_session() as session:
-            try:
-                leads = await lead_service.get_leads_pending_followup(session)
-                logger.info("pending_followups_found", count=len(leads))
-
-                for lead in leads:
-                    try:
-                        await lead_service.process_followup(session, lead)
-                    except Exception as e:
-                        logger.error(
-                            "followup_processing_error",
-                            lead_id=lead.id,
-                            error=str(e),
-                        )
-                        # Continue processing other leads
+        async def run_page(session: AsyncSession, leads: list[Lead]) -> None:
+            logger.info("pending_followups_found", count=len(leads))
 
-            except Exception as e:
-                logger.error("followup_job_error", error=str(e))
+            statuses = await self._fetch_followup_statuses(
+                [lead.monday_item_id for lead in leads]
+            )
+
+            await self._run_batch(
+                "followups",
+                session,
+                leads,
+                lambda lead_session, lead: lead_service.process_followup(
+                    lead_session,
+                    lead,
+                    current_status=statuses.get(lead.monday_item_id),
+                ),
+                error_event="followup_processing_error",
+            )
+
+        try:
+            with SCHEDULER_JOB_SECONDS.labels(job="followups").time():
+                await self._run_paged(
+                    lead_service.claim_leads_pending_followup
+                    if settings.scheduler_claim_leads
+                    else lead_service.get_leads_pending_followup,
+                    lambda lead: lead.followup_due_at,
+                    run_page,
+                )
+        except Exception as e:
+            logger.error("followup_job_error", error=str(e))
 
         logger.info("followup_job_completed")
 
+    async def _run_paged(
+        self,
+        fetch_page: Callable[..., Awaitable[list[Lead]]],
+        due_at: Callable[[Lead], Any],
+        run_page: Callable[[AsyncSession, list[Lead]], Awaitable[None]],
+    ) -> None:
+        """
+        Stream due leads in keyset pages of scheduler_page_size, ordered by (due_at, id).
+
+        Each page is loaded (claimed, when scheduler_claim_leads is on) and
+        processed in its own session, so memory stays flat on a large backlog;
+        _run_batch commits progress within the page.
+        """
+        page_size = max(1, settings.scheduler_page_size)
+        after: tuple[datetime, int] | None = None
+
+        while True:
+            # Claiming writes the lease; a plain page is read on the reader pool
+            async with (
+                get_session() if settings.scheduler_claim_leads else get_read_session()
+            ) as fetch_session:
+                leads = await fetch_page(fetch_session, limit=page_size, after=after)
+            if not leads:
+                return
+            last = leads[-1]
+            cursor = (due_at(last), last.id)
+
+            # No connection is held during sends: the page session only
+            # connects for its commits
+            async with get_session() as session:
+                session.add_all(leads)
+                await run_page(session, leads)
+
+            if len(leads) < page_size:
+                return
+            after = cursor
+
+    async def _run_batch(
+        self,
+        job_name: str,
+        session: AsyncSession,
+        leads: list[Lead],
+        handler: Callable[[AsyncSession, Lead], Awaitable[Any]],
+        error_event: str,
+    ) -> None:
+        """
+        Run handler for every lead with at most scheduler_max_concurrency in flight.
+
+        Each lead is isolated: a failure is logged and recorded on the lead
+        (retry backoff / dead letter) and does not affect the others. Progress
+        is committed according to scheduler_commit_strategy:
+
+        - "lead": each lead runs in its own session and commits as soon as it
+          is done, so a crash never resends an already-sent message
+        - "every_n" / "time_slice": leads run in waves and are committed on
+          the page session after every scheduler_commit_every_n leads or once
+          scheduler_commit_interval_seconds have passed. An AsyncSession must
+          not be used by concurrent tasks, so each lead's handler stages its
+          Monday writes in a session of its own; they are moved into the page
+          session one after another once the wave is done
+        - "page": one commit after the whole page
+
+        A failed commit never drops other leads' results: the affected leads'
+        state is saved again in a fresh transaction (see _commit_leads).
+        Batch timing and outcome counts are logged when done.
+        """
+        if not leads:
+            return
+
+        strategy = settings.scheduler_commit_strategy
+        concurrency = max(1, settings.scheduler_max_concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+        started = time.perf_counter()
+
+        async def run_one(unit_session: AsyncSession, lead: Lead) -> bool:
+            # The page's lease may have run out while earlier leads were sent
+            if settings.scheduler_claim_leads and not await lead_service.renew_lease(lead):
+                logger.warning("lead_skipped_lease_lost", job=job_name, lead_id=lead.id)
+                return False
+            try:
+                await handler(unit_session, lead)
+                return True
+            except Exception as e:
+                logger.error(error_event, lead_id=lead.id, error=str(e))
+                lead_service.record_failure(lead, e)
+                # Continue processing other leads
+                return False
+
+        async def run_in_own_session(lead: Lead) -> bool:
+            async with semaphore:
+                try:
+                    # merge(load=False) attaches the lead without a SELECT, so the
+                    # connection is only taken for the commit
+                    async with get_session() as lead_session:
+                        unit = await lead_session.merge(lead, load=False)
+                        succeeded = await run_one(lead_session, unit)
+                        saved = await self._commit_leads(job_name, lead_session, [unit])
+                        return saved and succeeded
+                except Exception as e:
+                    logger.error(error_event, lead_id=lead.id, error=str(e))
+                    return False
+
+        async def run_in_wave(lead: Lead) -> tuple[bool, list[tuple[str, str, str]]]:
+            async with semaphore:
+                # Never connects: only holds what the handler stages
+                async with async_session_factory() as staging_session:
+                    succeeded = await run_one(staging_session, lead)
+                    return succeeded, monday_outbox.take_staged(staging_session)
+
+        outcomes: list[bool | BaseException] = []
+        if strategy == "lead":
+            outcomes = await asyncio.gather(
+                *(run_in_own_session(lead) for lead in leads), return_exceptions=True
+            )
+        else:
+            # Commits only happen between waves, never while a handler is mid-flight
+            wave_size = {
+                "every_n": max(1, settings.scheduler_commit_every_n),
+                "time_slice": concurrency,
+            }.get(strategy, len(leads))
+            last_commit = time.monotonic()
+            uncommitted: list[Lead] = []
+            for i in range(0, len(leads), wave_size):
+                wave = leads[i : i + wave_size]
+                for result in await asyncio.gather(
+                    *(run_in_wave(lead) for lead in wave), return_exceptions=True
+                ):
+                    if isinstance(result, BaseException):
+                        outcomes.append(result)
+                        continue
+                    succeeded, outbox_writes = result
+                    for monday_item_id, status, column_id in outbox_writes:
+                        monday_outbox.add(session, monday_item_id, status, column_id)
+                    outcomes.append(succeeded)
+                uncommitted += wave
+
+                rest = leads[i + wave_size :]
+                if (
+                    not rest
+                    or strategy == "every_n"
+                    or (
+                        strategy == "time_slice"
+                        and time.monotonic() - last_commit
+                        >= settings.scheduler_commit_interval_seconds
+                    )
+                ):
+                    await self._commit_leads(job_name, session, uncommitted)
+                    uncommitted = []
+                    last_commit = time.monotonic()
+                    # A failed commit rolls back (and expires) the page; reload the rest
+                    for lead in rest:
+                        if inspect(lead).expired_attributes:
+                            await session.refresh(lead)
+
+        results: list[bool] = []
+        for lead, outcome in zip(leads, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(error_event, lead_id=lead.id, error=str(outcome))
+            results.append(outcome is True)
+
+        succeeded = sum(results)
+        SCHEDULER_BATCH_SIZE.labels(job=job_name).observe(len(leads))
+        SCHEDULER_LEADS_TOTAL.labels(job=job_name, outcome="succeeded").inc(succeeded)
+        SCHEDULER_LEADS_TOTAL.labels(job=job_name, outcome="failed").inc(len(leads) - succeeded)
+
+        logger.info(
+            "scheduler_batch_completed",
+            job=job_name,
+            batch_size=len(leads),
+            succeeded=succeeded,
+            failed=len(leads) - succeeded,
+            concurrency=concurrency,
+            commit_strategy=strategy,
+            duration_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+
+    async def _commit_leads(
+        self, job_name: str, session: AsyncSession, leads: list[Lead]
+    ) -> bool:
+        """
+        Commit processed leads.
+
+        With scheduler_claim_leads, only leads still leased to this worker are
+        written back (and released); the results for leads taken over by
+        another worker are discarded. If the commit fails, the leads' state
+        (e.g. first_message_sent after a send) is written again in a fresh
+        transaction, together with their staged Monday status writes, so an
+        already-sent message is not resent and Monday still gets its status
+        update. Returns False if that fails too, or if a lead's lease was lost.
+        """
+        owned = True
+        if settings.scheduler_claim_leads:
+            owned_ids = await lead_service.release_leads(session, leads)
+            lost = [lead for lead in leads if lead.id not in owned_ids]
+            if lost:
+                owned = False
+                logger.error(
+                    "lead_lease_lost", job=job_name, lead_ids=[lead.id for lead in lost]
+                )
+                for lead in lost:
+                    session.expunge(lead)
+                leads = [lead for lead in leads if lead.id in owned_ids]
+
+        states = {lead.id: lead_service.lead_state(lead) for lead in leads}
+        outbox_writes = monday_outbox.take_staged(session)
+        try:
+            await session.commit()
+            return owned
+        except Exception as e:
+            logger.error(
+                "scheduler_commit_failed", job=job_name, lead_ids=list(states), error=str(e)
+            )
+            await session.rollback()
+            return await lead_service.save_lead_states(states, outbox_writes) and owned
+
+    async def _fetch_followup_statuses(self, item_ids: list[str]) -> dict[str, str]:
+        """
+        Fetch Monday statuses for a follow-up batch in as few calls as possible.
+
+        On failure an empty mapping is returned, so each lead falls back to
+        its own per-item Safety Check.
+        """
+        if not item_ids:
+            return {}
+
+        try:
+            return await monday_service.get_items_status(
+                item_ids, settings.monday_status_column_id
+            )
+        except MondayAPIError as e:
+            logger.error("bulk_safety_check_failed", error=str(e))
+            return {}
+
+    def next_send_window_start(self) -> datetime:
+        """Get the next send window opening as a naive UTC datetime."""
+        return send_window_calendar.next_open()
+
+    async def _seed_due_queue(self, defer_past_due: bool = True) -> None:
+        """
+        Replace the due queue contents with the pending due times from the DB.
+
+        Failed sends are re-queued at their backoff time (next_attempt_at).
+        With defer_past_due (after a run), any lead still past due is re-queued
+        after scheduler_interval_minutes instead of immediately; a resync
+        while waiting queues past-due leads as due now. Rebuilding rather than
+        adding keeps repeated resyncs from piling up entries.
+        """
+        async with get_read_session() as session:
+            due_times = await lead_service.get_pending_due_times(session)
+
+        now = datetime.utcnow()
+        retry_at = (
+            now + timedelta(minutes=settings.scheduler_interval_minutes)
+            if defer_past_due
+            else now
+        )
+        due_queue.clear()
+        for due_at, kind in due_times:
+            due_queue.push(due_at if due_at > now else retry_at, kind)
+
+        logger.info("due_queue_seeded", pending=len(due_times), queued=len(due_queue))
+
+    async def _wait_for_next_due(self) -> None:
+        """
+        Sleep until the earliest due time falls inside the send window.
+
+        Only leads created by this process wake the queue, so it is re-seeded
+        from the DB every scheduler_interval_minutes to pick up leads added by
+        other workers or instances.
+        """
+        resync_seconds = settings.scheduler_interval_minutes * 60
+        resync_at = time.monotonic() + resync_seconds
+
+        while True:
+            if time.monotonic() >= resync_at:
+                await self._seed_due_queue(defer_past_due=False)
+                resync_at = time.monotonic() + resync_seconds
+
+            now = datetime.utcnow()
+            next_due = due_queue.peek()
+            until_resync = resync_at - time.monotonic()
+
+            if next_due is None:
+                timeout = until_resync
+            elif next_due > now:
+                timeout = min((next_due - now).total_seconds(), until_resync)
+            elif self.is_within_send_window():
+                return
+            else:
+                timeout = min((self.next_send_window_start() - now).total_seconds(), until_resync)
+
+            await due_queue.wait(max(timeout, 0.0))
+
+    async def _run_due_loop(self) -> None:
+        """Event-driven loop: run jobs exactly when leads come due."""
+        due_queue.enabled = True
+        await self._seed_due_queue()
+
+        while True:
+            try:
+                await self._wait_for_next_due()
+
+                kinds = due_queue.pop_due(datetime.utcnow())
+                if DUE_INITIAL_MESSAGE in kinds:
+                    await self.process_pending_initial_messages()
+                if DUE_FOLLOWUP in kinds:
+                    await self.process_pending_followups()
+
+                await self._seed_due_queue()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("due_loop_error", error=str(e))
+                await asyncio.sleep(settings.scheduler_interval_minutes * 60)
+
     def start(self) -> None:
-        """Start the scheduler with message processing jobs."""
+        """
+        Start the scheduler with message processing jobs.
+
+        With scheduler_leader_election on, only the instance holding the
+        leader lease runs the jobs; the others wait and take over if it dies.
+        """
         if self._is_running:
             logger.warning("scheduler_already_running")
             return
 
+        self._is_running = True
+        if settings.scheduler_leader_election:
+            self._leader_task = asyncio.get_running_loop().create_task(
+                self._run_leader_election()
+            )
+            logger.info("scheduler_started", mode="leader_election", holder=self.leader.holder)
+            return
+
+        self._start_jobs()
+
+    def _start_jobs(self) -> None:
+        """Start the processing jobs (event loop task or interval jobs)."""
+        self._jobs_running = True
+
+        if settings.scheduler_mode == "event":
+            self._due_task = asyncio.get_running_loop().create_task(self._run_due_loop())
+            logger.info(
+                "scheduler_jobs_started",
+                mode="event",
+                initial_message_delay=settings.initial_message_delay_minutes,
+            )
+            return
+
         interval_minutes = settings.scheduler_interval_minutes
 
         # Add job for initial message processing (runs every 1-2 minutes)
@@ -140,19 +523,70 @@ class SchedulerService:
         )
 
         self.scheduler.start()
-        self._is_running = True
         logger.info(
-            "scheduler_started",
+            "scheduler_jobs_started",
+            mode="interval",
             interval_minutes=interval_minutes,
             initial_message_delay=settings.initial_message_delay_minutes,
         )
 
-    def stop(self) -> None:
-        """Stop the scheduler."""
+    def _stop_jobs(self) -> None:
+        """Stop the processing jobs (a job already running finishes on its own)."""
+        if not self._jobs_running:
+            return
+
+        if self._due_task is not None:
+            self._due_task.cancel()
+            self._due_task = None
+            due_queue.enabled = False
+            due_queue.clear()
+        else:
+            self.scheduler.shutdown(wait=False)
+            # A shut down APScheduler cannot be restarted after regaining leadership
+            self.scheduler = AsyncIOScheduler()
+        self._jobs_running = False
+        logger.info("scheduler_jobs_stopped")
+
+    async def _run_leader_election(self) -> None:
+        """Acquire/renew the leader lease; run the jobs only while it is held."""
+        while True:
+            try:
+                is_leader = await self.leader.acquire()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Can't prove the lease is still ours - step down until it is
+                logger.error("leader_lease_error", error=str(e))
+                is_leader = False
+
+            if is_leader and not self._jobs_running:
+                logger.info("scheduler_leadership_acquired", holder=self.leader.holder)
+                self._start_jobs()
+            elif not is_leader and self._jobs_running:
+                logger.warning("scheduler_leadership_lost", holder=self.leader.holder)
+                self._stop_jobs()
+
+            await asyncio.sleep(settings.scheduler_leader_renew_seconds)
+
+    async def stop(self) -> None:
+        """Stop the scheduler (and hand over leadership, if held)."""
         if not self._is_running:
             return
 
-        self.scheduler.shutdown(wait=False)
+        if self._leader_task is not None:
+            self._leader_task.cancel()
+            await asyncio.gather(self._leader_task, return_exceptions=True)
+            self._leader_task = None
+            was_leader = self._jobs_running
+            self._stop_jobs()
+            if was_leader:
+                try:
+                    await self.leader.release()
+                except Exception as e:
+                    logger.error("leader_lease_release_failed", error=str(e))
+        else:
+            self._stop_jobs()
+
         self._is_running = False
         logger.info("scheduler_stopped")
 
@@ -0,0 +1,87 @@
+"""Send window calendar - computes when messages may be sent (Israel Time)."""
+
+from datetime import date, datetime, timedelta
+
+import pytz
+
+from src.core.config import get_settings
+
+settings = get_settings()
+
+# Israel timezone for time window checks
+ISRAEL_TZ = pytz.timezone("Asia/Jerusalem")
+
+# Give up searching for an opening after this many days (misconfigured calendar)
+MAX_SEARCH_DAYS = 366
+
+
+class SendWindowCalendar:
+    """
+    Calendar of allowed send hours in Asia/Jerusalem.
+
+    Default hours apply every day unless overridden per weekday (an empty
+    override closes the day, e.g. Shabbat). Holidays are closed all day.
+    All datetimes taken and returned are naive UTC, matching the Lead model.
+    """
+
+    def __init__(self) -> None:
+        self.default_hours = (settings.send_window_start_hour, settings.send_window_end_hour)
+        self.weekday_hours = {
+            weekday: (hours[0], hours[1]) if len(hours) == 2 else None
+            for weekday, hours in settings.send_window_weekday_hours.items()
+        }
+        self.holidays = set(settings.send_window_holidays)
+
+    def hours_for(self, day: date) -> tuple[int, int] | None:
+        """Get (start_hour, end_hour) for a local date, or None if closed."""
+        if day in self.holidays:
+            return None
+        return self.weekday_hours.get(day.weekday(), self.default_hours)
+
+    def is_open(self, at: datetime | None = None) -> bool:
+        """Check if sending is allowed at the given UTC time (default: now)."""
+        local = self._to_local(at)
+        hours = self.hours_for(local.date())
+        return hours is not None and hours[0] <= local.hour < hours[1]
+
+    def next_open(self, at: datetime | None = None) -> datetime:
+        """
+        Get the earliest allowed send time at or after the given UTC time.
+
+        Returns `at` itself if the window is open then.
+        """
+        at = at or datetime.utcnow()
+        local = self._to_local(at)
+
+        for offset in range(MAX_SEARCH_DAYS):
+            day = local.date() + timedelta(days=offset)
+            hours = self.hours_for(day)
+            if hours is None:
+                continue
+
+            start_hour, end_hour = hours
+            if offset == 0:
+                if start_hour <= local.hour < end_hour:
+                    return at
+                if local.hour >= end_hour:
+                    continue
+
+            return self._to_utc(day, start_hour)
+
+        return self._to_utc(local.date() + timedelta(days=MAX_SEARCH_DAYS), 0)
+
+    @staticmethod
+    def _to_local(at: datetime | None) -> datetime:
+        """Convert a naive UTC datetime (default: now) to Israel time."""
+        if at is None:
+            return datetime.now(ISRAEL_TZ)
+        return pytz.utc.localize(at).astimezone(ISRAEL_TZ)
+
+    @staticmethod
+    def _to_utc(day: date, hour: int) -> datetime:
+        """Convert a local Israel date and hour to naive UTC."""
+        local = ISRAEL_TZ.localize(datetime(day.year, day.month, day.day, hour))
+        return local.astimezone(pytz.utc).replace(tzinfo=None)
+
+
+send_window_calendar = SendWindowCalendar()
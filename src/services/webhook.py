@@ -0,0 +1,147 @@
+"""Webhook processing service - handles Monday and Meta webhook payloads."""
+
+import asyncio
+
+from pydantic import ValidationError
+
+from src.core.config import get_settings
+from src.core.logging import get_logger
+from src.db.session import get_session
+from src.schemas.meta import MetaWebhookMessage
+from src.schemas.monday import MondayWebhookChallenge, MondayWebhookEvent
+from src.services.lead import lead_service
+from src.services.monday import STATUS_CUSTOMER_REPLIED, monday_service
+from src.services.monday_outbox import monday_outbox
+from src.services.webhook_parser import parse_meta_messages, parse_monday_payload
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Webhook sources
+SOURCE_MONDAY = "monday"
+SOURCE_META = "meta"
+
+
+class WebhookService:
+    """Service for processing webhook payloads (inline or from the ingestion queue)."""
+
+    async def process_monday_payload(self, raw: bytes | str) -> dict[str, str]:
+        """
+        Process a raw Monday.com webhook body (as stored by the ingestion queue).
+
+        Returns the response content for the webhook caller.
+        """
+        try:
+            payload = parse_monday_payload(raw)
+        except ValidationError as e:
+            logger.error("invalid_webhook_payload", error=str(e))
+            return {"status": "invalid payload"}
+
+        if isinstance(payload, MondayWebhookChallenge):
+            return {"challenge": payload.challenge}
+        # Failures propagate so the queue retries (or parks) the event
+        return await self.process_monday_event(payload.event, raise_errors=True)
+
+    async def process_monday_event(
+        self, event: MondayWebhookEvent, raise_errors: bool = False
+    ) -> dict[str, str]:
+        """
+        Process a Monday.com new item event.
+
+        Args:
+            event: Validated Monday event
+            raise_errors: Re-raise unexpected errors (Monday API, DB, timeouts)
+                instead of reporting them as {"status": "error"}
+
+        Returns the response content for the webhook caller.
+        """
+        item_id = str(event.pulseId)
+
+        logger.info(
+            "processing_monday_event",
+            item_id=item_id,
+            board_id=event.boardId,
+            group_id=event.groupId,
+        )
+
+        # Process the new lead
+        async with get_session() as session:
+            try:
+                await lead_service.process_new_lead(session, item_id)
+                return {"status": "processed"}
+            except ValueError as e:
+                # Lead already exists or missing data
+                logger.warning("lead_processing_skipped", error=str(e))
+                return {"status": "skipped", "reason": str(e)}
+            except Exception as e:
+                logger.error("lead_processing_failed", error=str(e))
+                if raise_errors:
+                    raise
+                return {"status": "error", "reason": str(e)}
+
+    async def process_meta_payload(self, raw: bytes | str) -> None:
+        """Process a raw Meta webhook body (as stored by the ingestion queue)."""
+        await self.process_meta_messages(parse_meta_messages(raw))
+
+    async def process_meta_messages(self, messages: list[MetaWebhookMessage]) -> None:
+        """
+        Process incoming WhatsApp messages from a Meta webhook payload.
+
+        All messages are handled as one batch:
+        1. Collect the sender phones
+        2. Find and mark the matching active leads done (one query + one bulk UPDATE)
+        3. Update Monday status to indicate reply received, for all leads together
+           (via the outbox in the same transaction when it is enabled)
+        """
+        sender_phones: list[str] = []
+
+        for message in messages:
+            logger.info(
+                "incoming_whatsapp_message",
+                from_phone=message.from_,
+                type=message.type,
+                message_id=message.id,
+            )
+            if message.from_:
+                sender_phones.append(message.from_)
+
+        if not sender_phones:
+            return
+
+        async with get_session() as session:
+            leads = await lead_service.mark_leads_replied(session, sender_phones)
+            if settings.monday_outbox_enabled:
+                # Status writes commit with the leads and are sent by the outbox dispatcher
+                for lead in leads:
+                    monday_outbox.add(
+                        session,
+                        lead.monday_item_id,
+                        STATUS_CUSTOMER_REPLIED,
+                        settings.monday_status_column_id,
+                    )
+
+        if not leads or settings.monday_outbox_enabled:
+            return
+
+        # Update Monday status to indicate customer replied
+        results = await asyncio.gather(
+            *(
+                monday_service.update_item_status(
+                    lead.monday_item_id, STATUS_CUSTOMER_REPLIED
+                )
+                for lead in leads
+            ),
+            return_exceptions=True,
+        )
+        for lead, result in zip(leads, results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "failed_to_update_monday_on_reply",
+                    lead_id=lead.id,
+                    error=str(result),
+                )
+            else:
+                logger.info("monday_status_updated_on_reply", lead_id=lead.id)
+
+
+webhook_service = WebhookService()
@@ -0,0 +1,126 @@
+"""
+Webhook body parsing - raw bytes straight to typed payloads.
+
+Bodies are decoded and validated in one step by pre-built Pydantic
+TypeAdapters (validate_json parses with pydantic-core's native JSON parser,
+without an intermediate dict). Meta status-only deliveries (sent / delivered
+/ read receipts) are recognised with a byte scan and never parsed.
+"""
+
+import json
+import re
+from typing import Annotated, Any
+
+from pydantic import Field, TypeAdapter, ValidationError
+
+from src.core.logging import get_logger
+
+from src.schemas.meta import (
+    MetaWebhookChange,
+    MetaWebhookEntry,
+    MetaWebhookMessage,
+    MetaWebhookPayload,
+    MetaWebhookValue,
+)
+from src.schemas.monday import MondayWebhookChallenge, MondayWebhookPayload
+
+# A challenge body is answered before event validation, like Monday expects
+MONDAY_PAYLOAD_ADAPTER: TypeAdapter[MondayWebhookChallenge | MondayWebhookPayload] = TypeAdapter(
+    Annotated[
+        MondayWebhookChallenge | MondayWebhookPayload,
+        Field(union_mode="left_to_right"),
+    ]
+)
+META_PAYLOAD_ADAPTER: TypeAdapter[MetaWebhookPayload] = TypeAdapter(MetaWebhookPayload)
+META_MESSAGE_ADAPTER: TypeAdapter[MetaWebhookMessage] = TypeAdapter(MetaWebhookMessage)
+
+# Only payloads carrying inbound messages have a "messages" key (the change's
+# "field": "messages" value is not followed by a colon)
+_META_MESSAGES_KEY = re.compile(rb'"messages"\s*:')
+
+logger = get_logger(__name__)
+
+
+def parse_monday_payload(raw: bytes | str) -> MondayWebhookChallenge | MondayWebhookPayload:
+    """
+    Decode and validate a Monday webhook body.
+
+    Raises:
+        pydantic.ValidationError: If the body is not JSON or not a Monday payload
+    """
+    return MONDAY_PAYLOAD_ADAPTER.validate_json(raw)
+
+
+def parse_meta_messages(raw: bytes | str) -> list[MetaWebhookMessage]:
+    """
+    Decode a Meta webhook body and return its inbound messages in one pass.
+
+    Status-only payloads return an empty list without being decoded. If any
+    part of the payload is malformed, the messages are validated one at a
+    time instead and the invalid ones are skipped, so one bad message does
+    not drop the rest of the batch.
+
+    Raises:
+        pydantic.ValidationError: If the body is not JSON
+    """
+    if isinstance(raw, str):
+        raw = raw.encode("utf-8")
+    if not _META_MESSAGES_KEY.search(raw):
+        return []
+
+    try:
+        payload = META_PAYLOAD_ADAPTER.validate_json(raw)
+    except ValidationError as e:
+        if any(error["type"] == "json_invalid" for error in e.errors()):
+            raise
+        return _salvage_meta_messages(json.loads(raw))
+
+    return [
+        message
+        for entry in payload.entry
+        for change in entry.changes
+        for message in change.value.messages or []
+    ]
+
+
+def _list_at(obj: Any, key: str) -> list[Any]:
+    """obj[key] if obj is a dict holding a list there, else an empty list."""
+    value = obj.get(key) if isinstance(obj, dict) else None
+    return value if isinstance(value, list) else []
+
+
+def _salvage_meta_messages(data: Any) -> list[MetaWebhookMessage]:
+    """Validate each message of a decoded Meta payload on its own, skipping invalid ones."""
+    messages: list[MetaWebhookMessage] = []
+    errors: list[str] = []
+
+    for entry in _list_at(data, "entry"):
+        for change in _list_at(entry, "changes"):
+            value = change.get("value") if isinstance(change, dict) else None
+            for item in _list_at(value, "messages"):
+                try:
+                    messages.append(META_MESSAGE_ADAPTER.validate_python(item))
+                except ValidationError as e:
+                    # Locations and reasons only: inputs hold phones and message text
+                    errors += [
+                        f"{'.'.join(str(part) for part in error['loc']) or 'message'}: {error['msg']}"
+                        for error in e.errors(include_url=False, include_input=False)
+                    ]
+
+    logger.warning("meta_webhook_payload_salvaged", messages=len(messages), errors=errors)
+    return messages
+
+
+def dump_meta_messages(messages: list[MetaWebhookMessage]) -> str:
+    """Serialize messages as a minimal Meta webhook body (readable by parse_meta_messages)."""
+    payload = MetaWebhookPayload(
+        object="whatsapp_business_account",
+        entry=[
+            MetaWebhookEntry(
+                changes=[
+                    MetaWebhookChange(field="messages", value=MetaWebhookValue(messages=messages))
+                ]
+            )
+        ],
+    )
+    return META_PAYLOAD_ADAPTER.dump_json(payload, by_alias=True, exclude_none=True).decode()
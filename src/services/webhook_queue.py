@@ -0,0 +1,178 @@
+"""Durable webhook ingestion queue backed by the webhook_events table."""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import and_, delete, or_, select, update
+
+from src.core.config import get_settings
+from src.core.logging import get_logger
+from src.db.models import WebhookEvent
+from src.db.session import get_session
+from src.services.webhook import SOURCE_META, SOURCE_MONDAY, webhook_service
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Max seconds a failed event waits before it can be claimed again
+MAX_RETRY_DELAY_SECONDS = 60
+
+
+class WebhookQueue:
+    """
+    Store raw webhook events and process them with a pool of background consumers.
+
+    Events are claimed atomically (UPDATE ... RETURNING), so several consumers
+    (or processes) can share the queue. Failed events are retried after a
+    backoff (next_attempt_at) without holding a worker; events left
+    "processing" longer than the lease (crashed worker) are claimed again.
+    """
+
+    def __init__(self) -> None:
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task[None]] = []
+
+    async def enqueue(self, source: str, payload: str) -> int:
+        """Persist a raw webhook event and wake a consumer. Returns the event ID."""
+        async with get_session() as session:
+            event = WebhookEvent(source=source, payload=payload, status="pending")
+            session.add(event)
+            await session.flush()
+            event_id = event.id
+
+        self._wakeup.set()
+        return event_id
+
+    async def start(self) -> None:
+        """Start the consumer pool."""
+        workers = max(1, settings.webhook_queue_workers)
+        self._tasks = [
+            asyncio.create_task(self._consume(worker_id)) for worker_id in range(workers)
+        ]
+        logger.info("webhook_queue_started", workers=workers)
+
+    async def stop(self) -> None:
+        """Stop the consumer pool (unfinished events are retried on next start)."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("webhook_queue_stopped")
+
+    @staticmethod
+    def _claimable(now: datetime) -> Any:
+        """Due pending events, plus events whose processing lease has run out."""
+        stale_before = now - timedelta(seconds=settings.webhook_queue_lease_seconds)
+        return or_(
+            and_(
+                WebhookEvent.status == "pending",
+                or_(WebhookEvent.next_attempt_at.is_(None), WebhookEvent.next_attempt_at <= now),
+            ),
+            and_(
+                WebhookEvent.status == "processing",
+                # Claims without a time predate the claimed_at column
+                or_(WebhookEvent.claimed_at.is_(None), WebhookEvent.claimed_at < stale_before),
+            ),
+        )
+
+    async def _claim_next(self) -> tuple[int, str, str, int] | None:
+        """Atomically claim the oldest claimable event."""
+        now = datetime.utcnow()
+        next_id = (
+            select(WebhookEvent.id)
+            .where(self._claimable(now))
+            .order_by(WebhookEvent.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        async with get_session() as session:
+            result = await session.execute(
+                update(WebhookEvent)
+                .where(WebhookEvent.id == next_id, self._claimable(now))
+                .values(
+                    status="processing",
+                    attempts=WebhookEvent.attempts + 1,
+                    claimed_at=now,
+                )
+                .returning(
+                    WebhookEvent.id,
+                    WebhookEvent.source,
+                    WebhookEvent.payload,
+                    WebhookEvent.attempts,
+                )
+            )
+            row = result.first()
+
+        return tuple(row) if row else None  # type: ignore[return-value]
+
+    async def _process(self, source: str, payload: str) -> None:
+        """Dispatch a stored event body to the webhook service."""
+        if source == SOURCE_MONDAY:
+            result = await webhook_service.process_monday_payload(payload)
+            logger.info("queued_monday_event_processed", result=result.get("status"))
+        elif source == SOURCE_META:
+            await webhook_service.process_meta_payload(payload)
+        else:
+            raise ValueError(f"Unknown webhook source: {source}")
+
+    async def _consume(self, worker_id: int) -> None:
+        """Consumer loop: claim, process and settle events until cancelled."""
+        while True:
+            try:
+                claimed = await self._claim_next()
+                if claimed is None:
+                    try:
+                        await asyncio.wait_for(
+                            self._wakeup.wait(), settings.webhook_queue_poll_seconds
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                    self._wakeup.clear()
+                    continue
+
+                event_id, source, payload, attempts = claimed
+                try:
+                    await self._process(source, payload)
+                except Exception as e:
+                    await self._fail(event_id, attempts, str(e))
+                    continue
+
+                async with get_session() as session:
+                    await session.execute(
+                        delete(WebhookEvent).where(WebhookEvent.id == event_id)
+                    )
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("webhook_queue_consumer_error", worker=worker_id, error=str(e))
+                await asyncio.sleep(settings.webhook_queue_poll_seconds)
+
+    async def _fail(self, event_id: int, attempts: int, error: str) -> None:
+        """Release a failed event for retry, or park it once attempts run out."""
+        exhausted = attempts >= settings.webhook_queue_max_attempts
+        logger.error(
+            "webhook_event_failed",
+            event_id=event_id,
+            attempts=attempts,
+            exhausted=exhausted,
+            error=error,
+        )
+
+        # Back off before the event becomes claimable again (the worker moves on)
+        delay = min(2**attempts, MAX_RETRY_DELAY_SECONDS)
+        async with get_session() as session:
+            await session.execute(
+                update(WebhookEvent)
+                .where(WebhookEvent.id == event_id)
+                .values(
+                    status="failed" if exhausted else "pending",
+                    next_attempt_at=datetime.utcnow() + timedelta(seconds=delay),
+                    claimed_at=None,
+                    last_error=error,
+                )
+            )
+
+
+webhook_queue = WebhookQueue()
@@ -0,0 +1,30 @@
+"""Meta webhook signature verification (X-Hub-Signature-256)."""
+
+import hashlib
+import hmac
+
+META_SIGNATURE_HEADER = "X-Hub-Signature-256"
+SIGNATURE_PREFIX = "sha256="
+# "sha256=" followed by a hex-encoded SHA-256 digest
+SIGNATURE_LENGTH = len(SIGNATURE_PREFIX) + 2 * hashlib.sha256().digest_size
+
+
+def verify_meta_signature(raw_body: bytes, signature: str | None, app_secret: bytes) -> bool:
+    """
+    Check a Meta webhook signature: HMAC-SHA256 of the raw body, keyed by the app secret.
+
+    Missing or malformed headers are rejected before any hashing; well-formed
+    ones are compared in constant time.
+    """
+    if (
+        not signature
+        or len(signature) != SIGNATURE_LENGTH
+        or not signature.startswith(SIGNATURE_PREFIX)
+    ):
+        return False
+
+    expected = hmac.new(app_secret, raw_body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(
+        expected.encode("ascii"),
+        signature[len(SIGNATURE_PREFIX):].lower().encode("latin-1"),
+    )
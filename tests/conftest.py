@@ -0,0 +1,17 @@
+"""Shared test setup: required settings and a throwaway SQLite database."""
+
+import os
+import tempfile
+
+# Settings are read once at import, so they must be set before src is imported
+_db_dir = tempfile.mkdtemp(prefix="lead-automation-tests-")
+for key, value in {
+    "MONDAY_API_KEY": "test",
+    "MONDAY_BOARD_ID": "1",
+    "META_API_TOKEN": "test",
+    "META_PHONE_ID": "1",
+    "ENVIRONMENT": "production",
+    "LOG_LEVEL": "WARNING",
+    "DATABASE_URL": f"sqlite+aiosqlite:///{_db_dir}/test.db",
+}.items():
+    os.environ.setdefault(key, value)
@@ -0,0 +1,99 @@
+"""Scheduler batch commits."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import get_settings
+from src.db.models import Base, Lead, MondayStatusOutbox
+from src.db.session import close_db, engine, get_session
+from src.services.meta import meta_service
+from src.services.meta_throttle import MetaSendThrottler
+from src.services.monday import STATUS_MESSAGE_SENT
+from src.services.scheduler import scheduler_service
+
+settings = get_settings()
+
+
+async def _reset_db() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+@pytest.mark.parametrize("strategy", ["lead", "every_n", "page"])
+def test_failed_commit_keeps_outbox_write(
+    monkeypatch: pytest.MonkeyPatch, strategy: str
+) -> None:
+    """A failed batch commit saves the lead and its Monday status write together."""
+    monkeypatch.setattr(settings, "scheduler_commit_strategy", strategy)
+    monkeypatch.setattr(settings, "monday_outbox_enabled", True)
+    monkeypatch.setattr(settings, "use_whatsapp_templates", True)
+    monkeypatch.setattr(scheduler_service, "is_within_send_window", lambda: True)
+    # Per-recipient pacing would otherwise carry over between tests
+    monkeypatch.setattr(meta_service, "throttler", MetaSendThrottler())
+
+    sends: list[httpx.Request] = []
+
+    def meta_api(request: httpx.Request) -> httpx.Response:
+        sends.append(request)
+        return httpx.Response(200, json={"messages": [{"id": "wamid.test"}]})
+
+    # Fail the first commit that carries lead changes (the batch commit)
+    commit = AsyncSession.commit
+    failed: list[AsyncSession] = []
+
+    async def flaky_commit(session: AsyncSession) -> None:
+        if session.sync_session.dirty and not failed:
+            failed.append(session)
+            raise RuntimeError("disk I/O error")
+        await commit(session)
+
+    async def run() -> tuple[Lead, int]:
+        await _reset_db()
+        meta_service._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(meta_api), headers=meta_service.headers
+        )
+        try:
+            async with get_session() as session:
+                session.add(
+                    Lead(
+                        monday_item_id="1001",
+                        phone_number="0501234567",
+                        phone_e164="972501234567",
+                        lead_name="Test",
+                        first_message_due_at=datetime.utcnow() - timedelta(minutes=1),
+                        first_message_sent=False,
+                        is_done=False,
+                    )
+                )
+
+            monkeypatch.setattr(AsyncSession, "commit", flaky_commit)
+            await scheduler_service.process_pending_initial_messages()
+            monkeypatch.setattr(AsyncSession, "commit", commit)
+
+            async with get_session() as session:
+                lead = (await session.execute(select(Lead))).scalar_one()
+                outbox_rows = await session.scalar(
+                    select(func.count(MondayStatusOutbox.id)).where(
+                        MondayStatusOutbox.monday_item_id == "1001",
+                        MondayStatusOutbox.status == STATUS_MESSAGE_SENT,
+                    )
+                )
+            return lead, outbox_rows or 0
+        finally:
+            await meta_service.close()
+            await close_db()
+
+    lead, outbox_rows = asyncio.run(run())
+
+    assert failed, "the batch commit was not forced to fail"
+    assert len(sends) == 1
+    assert lead.first_message_sent is True
+    assert lead.status == STATUS_MESSAGE_SENT
+    assert lead.claimed_by is None
+    assert outbox_rows == 1